@@ -8,28 +8,63 @@ __version__ = "0.1.0"
 __author__ = "ASoc Contributors"
 __license__ = "MIT"
 
+import asyncio
+
 from .node_ready import NodeReady
 from .protocol_binary import (
     encode_frame,
+    encode_header,
     decode_header,
+    decode_header_from,
     encode_hello,
     decode_hello,
     encode_accept,
     decode_accept,
+    SealedFrameCipher,
+    data_frame_cipher,
+    encode_sealed_frame,
+    decode_sealed_payload,
     uuid_to_bytes,
     bytes_to_uuid,
 )
 from .discovery_binary import BinaryDiscovery
 
+
+def use_uvloop() -> bool:
+    """
+    Run asyncio on uvloop (optional dependency: pip install uvloop)
+    
+    Call once before asyncio.run() / creating nodes. Never done
+    automatically, so plain asyncio keeps working without uvloop.
+    
+    Returns:
+        True if uvloop's event loop policy was installed, False if uvloop
+        is not available
+    """
+    try:
+        import uvloop
+    except ImportError:
+        return False
+    asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
+    return True
+
+
 __all__ = [
     "NodeReady",
     "BinaryDiscovery",
+    "use_uvloop",
     "encode_frame",
+    "encode_header",
     "decode_header",
+    "decode_header_from",
     "encode_hello",
     "decode_hello",
     "encode_accept",
     "decode_accept",
+    "SealedFrameCipher",
+    "data_frame_cipher",
+    "encode_sealed_frame",
+    "decode_sealed_payload",
     "uuid_to_bytes",
     "bytes_to_uuid",
 ]
@@ -15,16 +15,31 @@ Usage:
 """
 
 import ssl
+import os
 import asyncio
+import secrets
+import functools
+import logging
 from pathlib import Path
-from typing import Optional
+from typing import Optional, Tuple, Union
+
+from .node_ready import NodeReady
+from .tls_config import _read_pem
+
+logger = logging.getLogger(__name__)
+
+
+def _mtimes(*paths: Optional[str]) -> Tuple[int, ...]:
+    """mtime_ns of each path (0 if unset) - part of the context cache key"""
+    return tuple(os.stat(p).st_mtime_ns if p else 0 for p in paths)
 
 
 def create_server_ssl_context(
     certfile: str,
     keyfile: str,
     ca_file: Optional[str] = None,
-    require_client_cert: bool = False
+    require_client_cert: bool = False,
+    cadata: Optional[str] = None
 ) -> ssl.SSLContext:
     """
     Create SSL context for ASoc server (accepts connections)
@@ -34,21 +49,39 @@ def create_server_ssl_context(
         keyfile: Path to server private key (PEM format)
         ca_file: Path to CA certificate for client verification (optional)
         require_client_cert: Whether to require client certificates
+        cadata: CA certificates as PEM text - use instead of ca_file to
+            skip the filesystem entirely
     
     Returns:
         Configured SSLContext for server
     
     Example:
         ssl_ctx = create_server_ssl_context('server.crt', 'server.key')
+    
+    Note:
+        Contexts are cached per (paths, options, file mtimes), so every node
+        built from the same certificate shares one SSLContext. Treat the
+        returned context as read-only.
     """
+    if ca_file and cadata is None:
+        cadata = _read_pem(ca_file)
+    return _build_server_ctx(
+        certfile, keyfile, cadata, require_client_cert,
+        _mtimes(certfile, keyfile)
+    )
+
+
+@functools.lru_cache(maxsize=32)
+def _build_server_ctx(certfile, keyfile, cadata, require_client_cert, mtimes):
+    """Build server context (cached, see create_server_ssl_context)"""
     context = ssl.create_default_context(ssl.Purpose.CLIENT_AUTH)
     
     # Load server certificate and key
     context.load_cert_chain(certfile, keyfile)
     
     # Optional: Verify client certificates
-    if ca_file:
-        context.load_verify_locations(ca_file)
+    if cadata:
+        context.load_verify_locations(cadata=cadata)
         if require_client_cert:
             context.verify_mode = ssl.CERT_REQUIRED
         else:
@@ -56,8 +89,16 @@ def create_server_ssl_context(
     else:
         context.verify_mode = ssl.CERT_NONE
     
-    # Disable old/insecure protocols
-    context.minimum_version = ssl.TLSVersion.TLSv1_2
+    # TLS 1.3 only: no version/cipher negotiation fallback, and the
+    # ClientHello carries just the three TLS 1.3 AEAD suites
+    context.minimum_version = ssl.TLSVersion.TLSv1_3
+    context.maximum_version = ssl.TLSVersion.TLSv1_3
+    context.options |= ssl.OP_NO_COMPRESSION
+    
+    # Record size needs no tuning: 16 KiB is only the ceiling, OpenSSL emits
+    # one record per write, so HELLO/ACCEPT/END frames already travel as
+    # tiny records while tensor chunks fill full ones. (Python exposes no
+    # SSL_CTX_set_max_send_fragment anyway.)
     
     return context
 
@@ -66,7 +107,8 @@ def create_client_ssl_context(
     ca_file: Optional[str] = None,
     certfile: Optional[str] = None,
     keyfile: Optional[str] = None,
-    verify_hostname: bool = False
+    verify_hostname: bool = False,
+    cadata: Optional[str] = None
 ) -> ssl.SSLContext:
     """
     Create SSL context for ASoc client (initiates connections)
@@ -76,6 +118,8 @@ def create_client_ssl_context(
         certfile: Path to client certificate for mutual TLS (optional)
         keyfile: Path to client private key for mutual TLS (optional)
         verify_hostname: Whether to verify server hostname (usually False for IPs)
+        cadata: CA certificates as PEM text - use instead of ca_file to
+            skip the filesystem entirely
     
     Returns:
         Configured SSLContext for client
@@ -93,12 +137,26 @@ def create_client_ssl_context(
             certfile='client.crt',
             keyfile='client.key'
         )
+    
+    Note:
+        Cached like create_server_ssl_context - treat as read-only.
     """
+    if ca_file and cadata is None:
+        cadata = _read_pem(ca_file)
+    return _build_client_ctx(
+        cadata, certfile, keyfile, verify_hostname,
+        _mtimes(certfile, keyfile)
+    )
+
+
+@functools.lru_cache(maxsize=32)
+def _build_client_ctx(cadata, certfile, keyfile, verify_hostname, mtimes):
+    """Build client context (cached, see create_client_ssl_context)"""
     context = ssl.create_default_context(ssl.Purpose.SERVER_AUTH)
     
     # Verify server certificate (if CA provided)
-    if ca_file:
-        context.load_verify_locations(ca_file)
+    if cadata:
+        context.load_verify_locations(cadata=cadata)
         context.verify_mode = ssl.CERT_REQUIRED
     else:
         # Self-signed certs: skip verification
@@ -112,12 +170,80 @@ def create_client_ssl_context(
     if certfile and keyfile:
         context.load_cert_chain(certfile, keyfile)
     
-    # Disable old/insecure protocols
-    context.minimum_version = ssl.TLSVersion.TLSv1_2
+    # TLS 1.3 only: no version/cipher negotiation fallback, and the
+    # ClientHello carries just the three TLS 1.3 AEAD suites
+    context.minimum_version = ssl.TLSVersion.TLSv1_3
+    context.maximum_version = ssl.TLSVersion.TLSv1_3
+    context.options |= ssl.OP_NO_COMPRESSION
     
     return context
 
 
+def _write_ec_certificate(
+    cert_path: Path,
+    key_path: Path,
+    common_name: str,
+    days_valid: int,
+    ca_cert_path: Optional[Path] = None,
+    ca_key_path: Optional[Path] = None,
+    is_ca: bool = False
+) -> None:
+    """
+    Write a P-256 key and X.509 certificate in-process
+    
+    Self-signed unless ca_cert_path/ca_key_path are given.
+    
+    Raises:
+        ImportError: if the optional cryptography package is missing
+    """
+    import datetime
+    from cryptography import x509
+    from cryptography.x509.oid import NameOID
+    from cryptography.hazmat.primitives import hashes, serialization
+    from cryptography.hazmat.primitives.asymmetric import ec
+    
+    key = ec.generate_private_key(ec.SECP256R1())
+    subject = x509.Name([x509.NameAttribute(NameOID.COMMON_NAME, common_name)])
+    
+    if ca_cert_path and ca_key_path:
+        ca_cert = x509.load_pem_x509_certificate(Path(ca_cert_path).read_bytes())
+        issuer = ca_cert.subject
+        signing_key = serialization.load_pem_private_key(
+            Path(ca_key_path).read_bytes(), password=None
+        )
+    else:
+        issuer = subject
+        signing_key = key
+    
+    now = datetime.datetime.now(datetime.timezone.utc)
+    builder = x509.CertificateBuilder().subject_name(
+        subject
+    ).issuer_name(
+        issuer
+    ).public_key(
+        key.public_key()
+    ).serial_number(
+        x509.random_serial_number()
+    ).not_valid_before(
+        now
+    ).not_valid_after(
+        now + datetime.timedelta(days=days_valid)
+    )
+    if is_ca:
+        builder = builder.add_extension(
+            x509.BasicConstraints(ca=True, path_length=0), critical=True
+        )
+    cert = builder.sign(signing_key, hashes.SHA256())
+    
+    key_path.write_bytes(key.private_bytes(
+        encoding=serialization.Encoding.PEM,
+        format=serialization.PrivateFormat.PKCS8,
+        encryption_algorithm=serialization.NoEncryption()
+    ))
+    key_path.chmod(0o600)
+    cert_path.write_bytes(cert.public_bytes(serialization.Encoding.PEM))
+
+
 def generate_self_signed_cert(
     output_dir: str = ".",
     hostname: str = "localhost",
@@ -126,7 +252,8 @@ def generate_self_signed_cert(
     """
     Generate self-signed certificate for testing
     
-    Requires: openssl command-line tool
+    Uses the cryptography package in-process if installed
+    (pip install asoc-protocol[tls]), else the openssl command-line tool
     
     Args:
         output_dir: Where to save cert and key
@@ -146,16 +273,19 @@ def generate_self_signed_cert(
     key_file = output_path / "key.pem"
     
     # Generate private key and self-signed certificate
-    cmd = [
-        "openssl", "req", "-x509", "-newkey", "rsa:4096",
-        "-keyout", str(key_file),
-        "-out", str(cert_file),
-        "-days", str(days_valid),
-        "-nodes",  # No password on key
-        "-subj", f"/CN={hostname}"
-    ]
-    
-    subprocess.run(cmd, check=True)
+    try:
+        _write_ec_certificate(cert_file, key_file, hostname, days_valid)
+    except ImportError:
+        cmd = [
+            "openssl", "req", "-x509", "-newkey", "rsa:4096",
+            "-keyout", str(key_file),
+            "-out", str(cert_file),
+            "-days", str(days_valid),
+            "-nodes",  # No password on key
+            "-subj", f"/CN={hostname}"
+        ]
+        
+        subprocess.run(cmd, check=True)
     
     print(f"✓ Generated self-signed certificate:")
     print(f"  Certificate: {cert_file}")
@@ -165,11 +295,45 @@ def generate_self_signed_cert(
     return str(cert_file), str(key_file)
 
 
+def _prime_ssl_context(server_context: ssl.SSLContext,
+                       client_context: ssl.SSLContext) -> None:
+    """
+    Run one complete in-memory handshake between a node's two contexts
+    
+    OpenSSL does per-context setup lazily on a context's first handshake:
+    about 0.8 ms extra here (first in-memory handshake 2.1 ms, later ones
+    1.3 ms). Doing it off the event loop keeps it out of the first real
+    peer connection.
+    """
+    server_in, server_out = ssl.MemoryBIO(), ssl.MemoryBIO()
+    client_in, client_out = ssl.MemoryBIO(), ssl.MemoryBIO()
+    server = server_context.wrap_bio(server_in, server_out, server_side=True)
+    client = client_context.wrap_bio(
+        client_in, client_out,
+        server_hostname="asoc-prime" if client_context.check_hostname else None
+    )
+    
+    # TLS 1.3 is three flights; shuttle bytes until both sides are done
+    try:
+        for _ in range(4):
+            for obj, out, peer_in in ((client, client_out, server_in),
+                                      (server, server_out, client_in)):
+                try:
+                    obj.do_handshake()
+                except ssl.SSLWantReadError:
+                    pass
+                peer_in.write(out.read())
+    except ssl.SSLError as e:
+        # e.g. our own certificate doesn't verify against the CA - the
+        # context setup has run by then anyway
+        logger.debug("TLS priming handshake stopped early: %s", e)
+
+
 # =============================================================================
 # Modified NodeReady with TLS Support
 # =============================================================================
 
-class NodeReadyTLS:
+class NodeReadyTLS(NodeReady):
     """
     ASoc Node with optional TLS encryption
     
@@ -179,7 +343,7 @@ class NodeReadyTLS:
     def __init__(self,
                  community: str,
                  api_key: str,
-                 ssl_context: Optional[ssl.SSLContext] = None,
+                 ssl_context: Union[ssl.SSLContext, Tuple[str, ...], None] = None,
                  static_peers: Optional[list] = None,
                  enable_discovery: bool = None,
                  node_id: Optional[str] = None,
@@ -187,39 +351,46 @@ class NodeReadyTLS:
                  port: int = 9000):
         """
         Args:
-            ssl_context: Optional SSLContext for TLS encryption
+            ssl_context: Optional SSLContext for TLS encryption, or a
+                (certfile, keyfile[, ca_file]) tuple - paths go through the
+                context cache so nodes sharing a certificate share a context.
+                Dials use a client context: this one if it is client-side,
+                else create_client_ssl_context(ca_file)
             ... (all other params same as NodeReady)
         """
-        # ... (same initialization as NodeReady)
+        super().__init__(
+            community,
+            api_key,
+            static_peers=static_peers,
+            enable_discovery=enable_discovery,
+            node_id=node_id,
+            host=host,
+            port=port
+        )
+        
+        ca_file = None
+        if isinstance(ssl_context, tuple):
+            ca_file = ssl_context[2] if len(ssl_context) > 2 else None
+            ssl_context = create_server_ssl_context(*ssl_context)
         self.ssl_context = ssl_context
         
+        # A server context can't dial (PROTOCOL_TLS_SERVER) - outbound
+        # connections get a cached client context instead
+        if ssl_context is None or ssl_context.protocol != ssl.PROTOCOL_TLS_SERVER:
+            self.client_ssl_context = ssl_context
+        else:
+            self.client_ssl_context = create_client_ssl_context(ca_file)
+        
         if ssl_context:
             print(f"🔒 TLS enabled")
     
-    async def _start_server(self):
-        """Start TCP server with optional TLS"""
-        server = await asyncio.start_server(
-            self._handle_client,
-            self.host,
-            self.port,
-            reuse_address=True,
-            ssl=self.ssl_context  # ← Just add this!
-        )
-        # ... rest same
-    
-    async def _connect_peer(self, host: str, port: int):
-        """Connect to peer with optional TLS"""
-        try:
-            reader, writer = await asyncio.wait_for(
-                asyncio.open_connection(
-                    host, port,
-                    ssl=self.ssl_context  # ← Just add this!
-                ),
-                timeout=5.0
-            )
-            # ... rest same
-        except Exception as e:
-            pass
+    async def start(self):
+        """Start node, priming TLS in a worker thread first"""
+        if self.ssl_context and self.ssl_context.protocol == ssl.PROTOCOL_TLS_SERVER:
+            loop = asyncio.get_running_loop()
+            await loop.run_in_executor(None, _prime_ssl_context,
+                                       self.ssl_context, self.client_ssl_context)
+        await super().start()
 
 
 # =============================================================================
@@ -349,6 +520,55 @@ async def example_mixed_mode():
 # Certificate Generation Helper
 # =============================================================================
 
+def _generate_node_certificate(output_dir: str, cluster_name: str, i: int) -> int:
+    """Generate and CA-sign node-{i}.key/.crt (worker for the process pool)"""
+    import subprocess
+    
+    output = Path(output_dir)
+    
+    try:
+        _write_ec_certificate(
+            output / f"node-{i}.crt",
+            output / f"node-{i}.key",
+            f"{cluster_name}-node-{i}",
+            365,
+            ca_cert_path=output / "ca.crt",
+            ca_key_path=output / "ca.key"
+        )
+        return i
+    except ImportError:
+        pass
+    
+    # Generate private key (P-256: far cheaper than RSA-4096 keygen)
+    subprocess.run([
+        "openssl", "ecparam", "-name", "prime256v1", "-genkey", "-noout",
+        "-out", str(output / f"node-{i}.key")
+    ], check=True, capture_output=True)
+    
+    # Generate CSR
+    subprocess.run([
+        "openssl", "req", "-new", "-batch",
+        "-key", str(output / f"node-{i}.key"),
+        "-out", str(output / f"node-{i}.csr"),
+        "-subj", f"/CN={cluster_name}-node-{i}"
+    ], check=True, capture_output=True)
+    
+    # Sign with CA (explicit serial: a shared ca.srl would race across workers)
+    subprocess.run([
+        "openssl", "x509", "-req",
+        "-in", str(output / f"node-{i}.csr"),
+        "-CA", str(output / "ca.crt"),
+        "-CAkey", str(output / "ca.key"),
+        "-set_serial", str(secrets.randbits(63)),
+        "-out", str(output / f"node-{i}.crt"),
+        "-days", "365"
+    ], check=True, capture_output=True)
+    
+    # Clean up CSR
+    (output / f"node-{i}.csr").unlink()
+    return i
+
+
 def setup_cluster_certificates(
     cluster_name: str,
     num_nodes: int,
@@ -363,10 +583,13 @@ def setup_cluster_certificates(
     - node-1.crt, node-1.key
     - ... (one per node)
     
+    Keys are ECDSA P-256; node certificates are generated in parallel,
+    in-process via cryptography when installed, else with the openssl CLI.
+    
     For production, use proper PKI instead!
     """
     import subprocess
-    from pathlib import Path
+    from concurrent.futures import ProcessPoolExecutor
     
     output = Path(output_dir)
     output.mkdir(exist_ok=True)
@@ -375,47 +598,31 @@ def setup_cluster_certificates(
     
     # 1. Generate CA
     print("  1. Generating CA...")
-    subprocess.run([
-        "openssl", "req", "-x509", "-newkey", "rsa:4096",
-        "-keyout", str(output / "ca.key"),
-        "-out", str(output / "ca.crt"),
-        "-days", "3650",
-        "-nodes",
-        "-subj", f"/CN={cluster_name}-CA"
-    ], check=True, capture_output=True)
-    
-    # 2. Generate certificate for each node
-    for i in range(num_nodes):
-        print(f"  2. Generating certificate for node-{i}...")
-        
-        # Generate private key
-        subprocess.run([
-            "openssl", "genrsa",
-            "-out", str(output / f"node-{i}.key"),
-            "4096"
-        ], check=True, capture_output=True)
-        
-        # Generate CSR
-        subprocess.run([
-            "openssl", "req", "-new",
-            "-key", str(output / f"node-{i}.key"),
-            "-out", str(output / f"node-{i}.csr"),
-            "-subj", f"/CN={cluster_name}-node-{i}"
-        ], check=True, capture_output=True)
-        
-        # Sign with CA
+    try:
+        _write_ec_certificate(
+            output / "ca.crt", output / "ca.key", f"{cluster_name}-CA", 3650,
+            is_ca=True
+        )
+    except ImportError:
         subprocess.run([
-            "openssl", "x509", "-req",
-            "-in", str(output / f"node-{i}.csr"),
-            "-CA", str(output / "ca.crt"),
-            "-CAkey", str(output / "ca.key"),
-            "-CAcreateserial",
-            "-out", str(output / f"node-{i}.crt"),
-            "-days", "365"
+            "openssl", "req", "-x509", "-batch",
+            "-newkey", "ec", "-pkeyopt", "ec_paramgen_curve:prime256v1",
+            "-keyout", str(output / "ca.key"),
+            "-out", str(output / "ca.crt"),
+            "-days", "3650",
+            "-nodes",
+            "-subj", f"/CN={cluster_name}-CA"
         ], check=True, capture_output=True)
-        
-        # Clean up CSR
-        (output / f"node-{i}.csr").unlink()
+    
+    # 2. Generate certificate for each node
+    print(f"  2. Generating {num_nodes} node certificates...")
+    with ProcessPoolExecutor() as executor:
+        list(executor.map(
+            _generate_node_certificate,
+            [str(output)] * num_nodes,
+            [cluster_name] * num_nodes,
+            range(num_nodes)
+        ))
     
     print(f"\n✓ Certificates generated in {output}/")
     print(f"  CA: ca.crt, ca.key")
@@ -484,6 +691,6 @@ if __name__ == "__main__":
     else:
         print("ASoc TLS Support")
         print("\nUsage:")
-        print("  python asoc_tls.py --generate-certs")
-        print("  python asoc_tls.py --generate-cluster 4")
-        print("  python asoc_tls.py --measure-overhead")
+        print("  python -m asoc.asoc_tls --generate-certs")
+        print("  python -m asoc.asoc_tls --generate-cluster 4")
+        print("  python -m asoc.asoc_tls --measure-overhead")
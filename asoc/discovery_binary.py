@@ -1,17 +1,57 @@
 import asyncio
+import logging
 import socket
+import struct
 import time
+import random
 import secrets
-from .protocol_binary import encode_discovery, decode_discovery, bytes_to_uuid
+from .protocol_binary import (
+    community_hash, discovery_prefix, discovery_mac_template, encode_discovery_prefixed, decode_discovery, bytes_to_uuid
+)
 
 DISCOVERY_PORT = 9999
-BROADCAST_ADDR = "<broadcast>"
 DISCOVERY_INTERVAL = 3
+MULTICAST_TTL = 1  # Stay on the local segment, like broadcast did
+
+logger = logging.getLogger(__name__)
+
+# Announcements between challenge RNG reseeds
+CHALLENGE_RESEED_INTERVAL = 1024
+
+# Replay filter: two rotating 2^20-bit bitmaps (128 KB each)
+CHALLENGE_FILTER_BITS = 20
+CHALLENGE_FILTER_BYTES = (1 << CHALLENGE_FILTER_BITS) >> 3
+
+
+def community_multicast_group(community: str) -> str:
+    """
+    Derive the IPv4 multicast group for a community
+    
+    239.x.y.z (administratively scoped) from the first 3 bytes of the
+    community hash, so only member hosts subscribe and non-members'
+    NICs filter the traffic instead of waking the kernel.
+    """
+    return "239." + ".".join(str(b) for b in community_hash(community)[:3])
+
+
+class _DiscoveryProtocol(asyncio.DatagramProtocol):
+    """Feeds datagrams straight into BinaryDiscovery - no per-packet await"""
+    
+    def __init__(self, discovery: "BinaryDiscovery"):
+        self._discovery = discovery
+    
+    def datagram_received(self, data: bytes, addr):
+        # Invalid packets are rejected by decode_discovery without raising;
+        # an exception here is a bug - log it and keep serving
+        try:
+            self._discovery._datagram_received(data, addr)
+        except Exception:
+            logger.exception("Discovery packet from %s failed", addr[0])
 
 
 class BinaryDiscovery:
     """
-    Ultra-compact binary discovery
+    Ultra-compact binary discovery over a per-community multicast group
     
     Message size: 50 bytes (vs 150+ for JSON)
     - Community hash: 8 bytes
@@ -20,6 +60,9 @@ class BinaryDiscovery:
     - Timestamp: 4 bytes
     - Challenge: 4 bytes
     - Signature: 16 bytes
+    
+    Not thread-safe: all state is touched only from the event loop thread,
+    so no locks are needed (none of the updates span an await).
     """
     
     def __init__(self, node_id_bytes: bytes, listen_port: int, 
@@ -28,89 +71,143 @@ class BinaryDiscovery:
         self.listen_port = listen_port
         self.community = community
         self.api_key = api_key
+        self._community_hash = community_hash(community)
+        self._mcast_group = community_multicast_group(community)
+        
+        # Community hash, node id and port never change - pack them once
+        self._prefix = discovery_prefix(community, node_id_bytes, listen_port)
+        self._mac_template = discovery_mac_template(api_key)
         
         # Discovered peers
         self.peers = {}  # node_id_bytes -> (ip, port, timestamp)
-        self._peers_lock = asyncio.Lock()
         
-        # Replay protection
-        self._seen_challenges = set()
-        self._challenges_lock = asyncio.Lock()
+        # Replay protection: double-buffered bloom filter over challenges.
+        # New challenges go into the active bitmap; both are checked. The
+        # cleanup loop clears and activates the older one, so a challenge is
+        # remembered for one to two cleanup periods instead of being dropped
+        # all at once when a set fills up.
+        self._bf = [bytearray(CHALLENGE_FILTER_BYTES), bytearray(CHALLENGE_FILTER_BYTES)]
+        self._bf_idx = 0
+        
+        # Challenges only need to be unique (they are covered by the MAC),
+        # so use a CSPRNG-seeded PRNG instead of a getrandom() per message.
+        # The low 16 bits are a counter: no repeats within 65536 messages.
+        self._chal_rng = random.Random(secrets.token_bytes(16))
+        self._chal_counter = 0
+        
+        # Single UDP socket for both directions (set up in start())
+        self._transport = None
+        self._send_handle = None
+        self._cleanup_task = None
     
     async def start(self):
-        asyncio.create_task(self._broadcast_loop())
-        asyncio.create_task(self._listen_loop())
-        asyncio.create_task(self._cleanup_loop())
-    
-    async def _broadcast_loop(self):
         sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
-        sock.setsockopt(socket.SOL_SOCKET, socket.SO_BROADCAST, 1)
+        sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        sock.bind(("", DISCOVERY_PORT))
+        sock.setsockopt(
+            socket.IPPROTO_IP,
+            socket.IP_ADD_MEMBERSHIP,
+            struct.pack('4s4s', socket.inet_aton(self._mcast_group),
+                        socket.inet_aton('0.0.0.0'))
+        )
+        sock.setsockopt(socket.IPPROTO_IP, socket.IP_MULTICAST_TTL, MULTICAST_TTL)
         sock.setblocking(False)
         
         loop = asyncio.get_running_loop()
+        self._transport, _ = await loop.create_datagram_endpoint(
+            lambda: _DiscoveryProtocol(self),
+            sock=sock
+        )
         
-        while True:
-            try:
-                # Generate random challenge each time
-                challenge = secrets.randbits(32)
-                
-                # Encode as 50-byte binary message
-                msg = encode_discovery(
-                    self.community,
-                    self.node_id_bytes,
-                    self.listen_port,
-                    self.api_key,
-                    timestamp=int(time.time()),
-                    challenge=challenge
-                )
-                
-                await loop.sock_sendto(sock, msg, (BROADCAST_ADDR, DISCOVERY_PORT))
-            except Exception:
-                pass
-            
-            await asyncio.sleep(DISCOVERY_INTERVAL)
+        self._send_announcement()
+        self._cleanup_task = asyncio.create_task(self._cleanup_loop())
     
-    async def _listen_loop(self):
-        sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
-        sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
-        sock.bind(("", DISCOVERY_PORT))
-        sock.setblocking(False)
+    def stop(self):
+        """Stop announcing, close the socket and end the cleanup loop"""
+        if self._send_handle is not None:
+            self._send_handle.cancel()
+            self._send_handle = None
+        if self._cleanup_task is not None:
+            self._cleanup_task.cancel()
+            self._cleanup_task = None
+        if self._transport is not None:
+            self._transport.close()
+            self._transport = None
+    
+    def _send_announcement(self):
+        """Multicast one announcement and reschedule (runs via call_later)"""
+        try:
+            challenge = self._next_challenge()
+            
+            # Encode as 50-byte binary message
+            msg = encode_discovery_prefixed(
+                self._prefix,
+                self.api_key,
+                int(time.time()),
+                challenge,
+                mac_template=self._mac_template
+            )
+            
+            # One datagram per interval regardless of peer count - the group
+            # does the fanout, so there is nothing to batch (sendmmsg etc.)
+            self._transport.sendto(msg, (self._mcast_group, DISCOVERY_PORT))
+        except Exception:
+            # Keep announcing - the next interval may well succeed
+            logger.exception("Discovery announcement to %s failed", self._mcast_group)
         
         loop = asyncio.get_running_loop()
+        self._send_handle = loop.call_later(DISCOVERY_INTERVAL, self._send_announcement)
+    
+    def _next_challenge(self) -> int:
+        """Unique per-message challenge (random high half, counter low half)"""
+        if self._chal_counter % CHALLENGE_RESEED_INTERVAL == 0:
+            self._chal_rng.seed(secrets.token_bytes(8))
+        challenge = (self._chal_rng.getrandbits(16) << 16) | (self._chal_counter & 0xFFFF)
+        self._chal_counter += 1
+        return challenge
+    
+    def _datagram_received(self, data: bytes, addr):
+        """Handle one inbound datagram (synchronous - no awaits needed)"""
+        # Decode and verify (returns None if invalid)
+        parsed = decode_discovery(data, self._community_hash, self.api_key,
+                                  mac_template=self._mac_template)
         
-        while True:
-            try:
-                data, addr = await loop.sock_recvfrom(sock, 1024)
-                
-                # Decode and verify (returns None if invalid)
-                parsed = decode_discovery(data, self.community, self.api_key)
-                
-                if not parsed:
-                    continue
-                
-                # Ignore our own broadcasts
-                if parsed['node_id'] == self.node_id_bytes:
-                    continue
-                
-                # Check for replay attacks
-                async with self._challenges_lock:
-                    if parsed['challenge'] in self._seen_challenges:
-                        continue
-                    self._seen_challenges.add(parsed['challenge'])
-                
-                # Valid peer discovered
-                async with self._peers_lock:
-                    self.peers[parsed['node_id']] = (
-                        addr[0], 
-                        parsed['port'],
-                        time.time()
-                    )
-                
-                node_uuid = bytes_to_uuid(parsed['node_id'])
-                print(f"✓ Discovered peer: {str(node_uuid)[:8]} at {addr[0]}:{parsed['port']}")
-                
-            except Exception as e:
-                await asyncio.sleep(0.1)
+        if not parsed:
+            return
+        
+        # Ignore our own broadcasts
+        if parsed['node_id'] == self.node_id_bytes:
+            return
+        
+        # Check for replay attacks
+        if self._check_and_add_challenge(parsed['challenge']):
+            return
+        
+        # Valid peer discovered
+        self.peers[parsed['node_id']] = (
+            addr[0],
+            parsed['port'],
+            time.time()
+        )
+        
+        if logger.isEnabledFor(logging.INFO):
+            node_uuid = bytes_to_uuid(parsed['node_id'])
+            logger.info("Discovered peer: %s at %s:%d", str(node_uuid)[:8], addr[0], parsed['port'])
+    
+    def _check_and_add_challenge(self, challenge: int) -> bool:
+        """Return True if challenge was (probably) seen, else record it"""
+        mask = (1 << CHALLENGE_FILTER_BITS) - 1
+        h1 = challenge & mask
+        h2 = ((challenge * 0x9E3779B1) & 0xFFFFFFFF) >> (32 - CHALLENGE_FILTER_BITS)
+        
+        for bf in self._bf:
+            if (bf[h1 >> 3] & (1 << (h1 & 7))) and (bf[h2 >> 3] & (1 << (h2 & 7))):
+                return True
+        
+        bf = self._bf[self._bf_idx]
+        bf[h1 >> 3] |= 1 << (h1 & 7)
+        bf[h2 >> 3] |= 1 << (h2 & 7)
+        return False
     
     async def _cleanup_loop(self):
         """Remove stale peers and old challenges"""
@@ -120,23 +217,18 @@ class BinaryDiscovery:
             now = time.time()
             
             # Remove stale peers (not seen in 15s)
-            async with self._peers_lock:
-                stale = [
-                    node_id for node_id, (_, _, ts) in self.peers.items()
-                    if now - ts > 15
-                ]
-                for node_id in stale:
-                    del self.peers[node_id]
+            self.peers = {
+                node_id: entry for node_id, entry in self.peers.items()
+                if now - entry[2] <= 15
+            }
             
-            # Limit challenge set size
-            async with self._challenges_lock:
-                if len(self._seen_challenges) > 10000:
-                    self._seen_challenges.clear()
+            # Age out the older replay bitmap
+            self._bf_idx ^= 1
+            self._bf[self._bf_idx] = bytearray(CHALLENGE_FILTER_BYTES)
     
-    async def get_peers(self):
+    def get_peers(self):
         """Get current peer list"""
-        async with self._peers_lock:
-            return {
-                node_id: (ip, port) 
-                for node_id, (ip, port, _) in self.peers.items()
-            }
+        return {
+            node_id: (ip, port)
+            for node_id, (ip, port, _) in self.peers.items()
+        }
@@ -1,60 +1,533 @@
 import asyncio
+import collections
+import contextlib
+import itertools
+import logging
+import os
+import socket
+import sys
 import uuid as uuid_module
 import time
 from typing import Optional
 import ssl
-from typing import Optional, List
+from typing import Optional, List, Union
 from .discovery_binary import BinaryDiscovery
 from .tls_config import setup_tls
 from .protocol_binary import (
     FRAME_HELLO, FRAME_ACCEPT, FRAME_DATA, FRAME_END,
     encode_hello, decode_hello, verify_hello,
-    encode_accept, decode_accept,
-    uuid_to_bytes, bytes_to_uuid, encode_frame, decode_header, HEADER_SIZE
+    encode_accept, decode_accept, handshake_mac_template,
+    uuid_to_bytes, bytes_to_uuid, pack_header, decode_header_from, HEADER_SIZE,
+    VERSION
 )
 
+# Per-frame receive logging goes here (DEBUG) rather than to stdout
+logger = logging.getLogger(__name__)
+
+# Outbound connection attempts in progress at once (large static peer lists)
+MAX_CONCURRENT_DIALS = 32
+
+# Peer socket tuning: kernel buffers sized for a stream of 1 MiB frames
+# (Linux caps them at net.core.wmem_max / rmem_max - raise those sysctls
+# to get the full size), and write watermarks that let several 1 MiB
+# chunks queue before send_frame() has to wait for the transport
+SOCKET_SNDBUF = 16 << 20
+SOCKET_RCVBUF = 16 << 20
+WRITE_BUFFER_HIGH = 4 << 20
+WRITE_BUFFER_LOW = 1 << 20
+
+# Dead-peer detection (Linux option names; unsupported ones are skipped):
+# unacked data fails the socket after TCP_USER_TIMEOUT ms, idle
+# connections are probed after KEEPIDLE s, every KEEPINTVL s, KEEPCNT times
+TCP_USER_TIMEOUT_MS = 10_000
+TCP_KEEPALIVE_OPTIONS = (
+    ("TCP_KEEPIDLE", 30),
+    ("TCP_KEEPINTVL", 5),
+    ("TCP_KEEPCNT", 3),
+    ("TCP_USER_TIMEOUT", TCP_USER_TIMEOUT_MS),
+)
+
+# Opt-in busy polling of peer sockets (Linux): ASOC_BUSY_POLL=<usecs> has
+# the kernel poll the NIC that long before sleeping a reader - lower
+# small-message latency for more CPU. Raising it past net.core.busy_read
+# needs CAP_NET_ADMIN; without it the option is skipped
+BUSY_POLL_ENV = "ASOC_BUSY_POLL"
+SO_BUSY_POLL = getattr(socket, "SO_BUSY_POLL", 46 if sys.platform.startswith("linux") else None)
+
+# Listening socket tuning (Linux): TFO queue length, and TCP_DEFER_ACCEPT
+# seconds - peers always speak first (HELLO / ClientHello), so accept()
+# only wakes us once that data is there
+TCP_FASTOPEN_QUEUE = 256
+TCP_DEFER_ACCEPT_SECS = 1
+
+# Parsed frames buffered per connection before the transport stops reading
+RECV_QUEUE_MAX = 64
+
+# Receive buffering: small frames are parsed out of one fixed buffer;
+# payloads of RECV_POOL_MIN bytes or more are received straight into
+# pooled bytearrays (up to RECV_POOL_SIZE kept per connection)
+RECV_BUFFER_SIZE = 256 << 10
+RECV_POOL_MIN = 64 << 10
+RECV_POOL_SIZE = 8
+
+# Completed streams remembered (oldest dropped first), so
+# wait_stream_complete() returns at once for any of them - however often,
+# and whether it is called before or after FRAME_END arrives
+STREAM_DONE_HISTORY = 1024
+
+# Per-address reconnect backoff after failed dials (seconds). A connection
+# that drops within RECONNECT_STABLE_SECS of ACCEPT counts as a failed dial
+# too, so a peer that accepts and then closes isn't redialed in a tight loop
+RECONNECT_BACKOFF_INITIAL = 1.0
+RECONNECT_BACKOFF_MAX = 30.0
+RECONNECT_STABLE_SECS = 10.0
+
+# send_stream() coalesces frames into one writelines() call until the batch
+# holds this many payload bytes; bigger batches only grow the copy the
+# transport makes of whatever the socket doesn't take right away
+STREAM_BATCH_BYTES = 256 << 10
+
+
+def _set_nodelay(sock):
+    """Disable Nagle so small handshake/control frames go out immediately"""
+    if sock is not None and sock.family in (socket.AF_INET, socket.AF_INET6):
+        try:
+            sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        except OSError:
+            pass
+
+
+@contextlib.asynccontextmanager
+async def _timeout_compat(delay):
+    """asyncio.timeout() stand-in for Python < 3.11"""
+    task = asyncio.current_task()
+    expired = False
+    
+    def expire():
+        nonlocal expired
+        expired = True
+        task.cancel()
+    
+    handle = asyncio.get_running_loop().call_later(delay, expire)
+    try:
+        yield
+    except asyncio.CancelledError:
+        if expired:
+            raise asyncio.TimeoutError from None
+        raise
+    finally:
+        handle.cancel()
+
+
+# Deadline on the current task - unlike wait_for(), no extra Task per await
+_timeout = getattr(asyncio, "timeout", _timeout_compat)
+
+
+def _configure_socket(transport, sndbuf=SOCKET_SNDBUF, rcvbuf=SOCKET_RCVBUF):
+    """Tune an accepted/dialed peer connection before any frames are sent"""
+    sock = transport.get_extra_info('socket')
+    _set_nodelay(sock)
+    if sock is not None:
+        for option, value in ((socket.SO_SNDBUF, sndbuf),
+                              (socket.SO_RCVBUF, rcvbuf),
+                              (socket.SO_KEEPALIVE, 1)):
+            try:
+                sock.setsockopt(socket.SOL_SOCKET, option, value)
+            except OSError:
+                pass
+        _set_tcp_options(sock, TCP_KEEPALIVE_OPTIONS)
+        _set_busy_poll(sock)
+    transport.set_write_buffer_limits(high=WRITE_BUFFER_HIGH, low=WRITE_BUFFER_LOW)
+
+
+def _set_busy_poll(sock):
+    """Apply ASOC_BUSY_POLL (microseconds) to sock, if set and supported"""
+    usecs = os.environ.get(BUSY_POLL_ENV)
+    if not usecs or SO_BUSY_POLL is None:
+        return
+    try:
+        sock.setsockopt(socket.SOL_SOCKET, SO_BUSY_POLL, int(usecs))
+    except (OSError, ValueError):
+        pass
+
+
+def _configure_listener(sock, rcvbuf=SOCKET_RCVBUF):
+    """Apply listen-socket options; unsupported ones are skipped"""
+    _set_nodelay(sock)
+    # Set here too so accepted sockets inherit it before the SYN-ACK
+    # advertises their window scale
+    try:
+        sock.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, rcvbuf)
+    except OSError:
+        pass
+    _set_tcp_options(sock, (("TCP_FASTOPEN", TCP_FASTOPEN_QUEUE),
+                            ("TCP_DEFER_ACCEPT", TCP_DEFER_ACCEPT_SECS)))
+
+
+def _set_tcp_options(sock, options):
+    """Set IPPROTO_TCP options by name, skipping any this platform lacks"""
+    for name, value in options:
+        option = getattr(socket, name, None)
+        if option is None:
+            continue
+        try:
+            sock.setsockopt(socket.IPPROTO_TCP, option, value)
+        except OSError:
+            pass
+
+
+def _stream_batches(stream_id, view, chunk_size):
+    """
+    DATA frames plus FRAME_END for view, as writelines() batches of about
+    STREAM_BATCH_BYTES (chunks are views into view, never copies)
+    """
+    buffers = []
+    batched = 0
+    seq = 0
+    for i in range(0, len(view), chunk_size):
+        chunk = view[i:i+chunk_size]
+        buffers += (pack_header(FRAME_DATA, stream_id, seq, len(chunk)), chunk)
+        batched += len(chunk)
+        seq += 1
+        if batched >= STREAM_BATCH_BYTES:
+            yield buffers
+            buffers = []
+            batched = 0
+    
+    buffers.append(pack_header(FRAME_END, stream_id, seq, 0))
+    yield buffers
+
+
+class _ResumingContext:
+    """
+    SSLContext stand-in that resumes a cached TLS session
+    
+    asyncio builds its SSLObject via context.wrap_bio() and offers no way to
+    pass session=, so this forwards everything to the real context and only
+    injects the session into wrap_bio.
+    """
+    
+    def __init__(self, context: ssl.SSLContext, session: ssl.SSLSession):
+        self._context = context
+        self._session = session
+    
+    def wrap_bio(self, incoming, outgoing, server_side=False, server_hostname=None):
+        return self._context.wrap_bio(
+            incoming, outgoing,
+            server_side=server_side,
+            server_hostname=server_hostname,
+            session=self._session
+        )
+    
+    def __getattr__(self, name):
+        return getattr(self._context, name)
+
+
+class FrameProtocol(asyncio.BufferedProtocol):
+    """
+    Callback-based frame parser
+    
+    Frames are cut out of the receive buffer directly instead of going
+    through StreamReader.readexactly() twice per frame; complete frames are
+    queued for the Connection that owns this protocol. Large payloads are
+    read by the transport straight into a pooled buffer (no intermediate
+    copy), which the consumer hands back with Connection.release().
+    """
+    
+    def __init__(self, on_connect=None, buffer_sizes=(SOCKET_SNDBUF, SOCKET_RCVBUF)):
+        self._on_connect = on_connect
+        self._buffer_sizes = buffer_sizes  # (SO_SNDBUF, SO_RCVBUF)
+        self._buf = bytearray(RECV_BUFFER_SIZE)
+        self._view = memoryview(self._buf)
+        self._start = 0          # parsed up to here
+        self._end = 0            # received up to here
+        self._length = None      # payload length once a header is parsed
+        self._header = None
+        
+        # Large payload currently being received in place
+        self._payload = None
+        self._payload_view = None
+        self._filled = 0
+        self.pool = []
+        
+        self.frames = asyncio.Queue()
+        self.transport = None
+        self.connection = None
+        self._paused = False
+        
+        # Write-side backpressure, driven by pause_writing()/resume_writing()
+        self.writable = asyncio.Event()
+        self.writable.set()
+        self.closed = asyncio.get_running_loop().create_future()
+    
+    def connection_made(self, transport):
+        self.transport = transport
+        _configure_socket(transport, *self._buffer_sizes)
+        self.connection = Connection(self)
+        if self._on_connect is not None:
+            self._on_connect(self.connection)
+    
+    def get_buffer(self, sizehint):
+        if self._payload is not None:
+            return self._payload_view[self._filled:]
+        return self._view[self._end:]
+    
+    def buffer_updated(self, nbytes):
+        if self._payload is not None:
+            self._filled += nbytes
+            if self._filled == self._length:
+                self._finish_payload()
+        else:
+            self._end += nbytes
+            self._parse()
+        
+        if not self._paused and self.frames.qsize() >= RECV_QUEUE_MAX:
+            self._paused = True
+            self.transport.pause_reading()
+    
+    def _parse(self):
+        view = self._view
+        start, end = self._start, self._end
+        
+        while True:
+            if self._length is None:
+                if end - start < HEADER_SIZE:
+                    break
+                version, frame_type, stream_id, seq, length = decode_header_from(view, start)
+                if version != VERSION:
+                    # Different wire format (RFC 0001: close the connection)
+                    logger.warning("Closing connection: frame version %d, expected %d",
+                                   version, VERSION)
+                    self._start = self._end = 0
+                    self.transport.abort()
+                    return
+                start += HEADER_SIZE
+                self._header = (frame_type, stream_id, seq)
+                self._length = length
+            
+            length = self._length
+            if length >= RECV_POOL_MIN:
+                # Copy what is already here; get_buffer() hands out the rest
+                self._payload = self._take_buffer(length)
+                self._payload_view = memoryview(self._payload)
+                n = min(end - start, length)
+                self._payload_view[:n] = view[start:start + n]
+                self._filled = n
+                start += n
+                if n < length:
+                    break
+                self._finish_payload()
+                continue
+            
+            if end - start < length:
+                break
+            self.frames.put_nowait(self._header + (bytes(view[start:start + length]),))
+            start += length
+            self._length = None
+        
+        # At most one partial small frame is left; keep room for the rest
+        if start == end:
+            start = end = 0
+        elif len(self._buf) - end < RECV_POOL_MIN + HEADER_SIZE:
+            remaining = end - start
+            view[:remaining] = view[start:end]
+            start, end = 0, remaining
+        self._start, self._end = start, end
+    
+    def _take_buffer(self, length):
+        pool = self.pool
+        if pool and len(pool[-1]) == length:
+            return pool.pop()
+        return bytearray(length)
+    
+    def _finish_payload(self):
+        self._payload_view.release()
+        self.frames.put_nowait(self._header + (self._payload,))
+        self._payload = None
+        self._payload_view = None
+        self._length = None
+    
+    def frame_consumed(self):
+        """Resume reading once the consumer has caught up"""
+        if self._paused and self.frames.qsize() < RECV_QUEUE_MAX // 2:
+            self._paused = False
+            if not self.transport.is_closing():
+                self.transport.resume_reading()
+    
+    def pause_writing(self):
+        self.writable.clear()
+    
+    def resume_writing(self):
+        self.writable.set()
+    
+    def connection_lost(self, exc):
+        # Wake both sides: readers see the sentinel, writers find is_closing()
+        self.frames.put_nowait(None)
+        self.writable.set()
+        if not self.closed.done():
+            self.closed.set_result(None)
+
 
 class Connection:
     """Connection with flow control and timeouts"""
     
-    def __init__(self, reader, writer, max_inflight=10):
-        self.reader = reader
-        self.writer = writer
-        self._send_semaphore = asyncio.Semaphore(max_inflight)
+    def __init__(self, protocol: FrameProtocol, max_inflight=10):
+        self.protocol = protocol
+        self.transport = protocol.transport
+        
+        # In-flight send gate: plain counter, Event only waited on when full
+        self._inflight = 0
+        self._max_inflight = max_inflight
+        self._send_ready = asyncio.Event()
+        self._send_ready.set()
+        
+        # Set while send_file() owns the socket; other sends wait on it so
+        # their frames can't land in the middle of a sendfile()'d payload
+        self._file_done = None
     
     async def send_frame(self, frame_type, stream_id, seq, payload=b""):
         """Send frame with timeout to prevent deadlock"""
-        async with self._send_semaphore:
-            frame = encode_frame(frame_type, stream_id, seq, payload)
-            self.writer.write(frame)
-            try:
-                await asyncio.wait_for(self.writer.drain(), timeout=10.0)
-            except asyncio.TimeoutError:
-                raise ConnectionError("Send timeout - peer may be dead")
+        # Header and payload go down as separate buffers - no header+payload
+        # concatenation copy of (up to 1 MiB) payloads
+        header = pack_header(frame_type, stream_id, seq, len(payload))
+        await self._send((header, payload) if payload else (header,))
     
-    async def recv_frame(self):
-        """Receive frame with timeout"""
+    async def send_stream(self, stream_id, data, chunk_size: int = 1_048_576):
+        """
+        Send data as DATA frames plus FRAME_END
+        
+        Frames are handed to the transport in batches of about
+        STREAM_BATCH_BYTES (one writelines() each), so a small stream goes
+        out with its END frame in a single write.
+        """
+        view = memoryview(data)
+        size = len(view)
+        if 0 < size <= chunk_size:
+            # Single-chunk tensor (the small-message case): no batching loop
+            await self._send((pack_header(FRAME_DATA, stream_id, 0, size), view,
+                              pack_header(FRAME_END, stream_id, 1, 0)))
+            return
+        
+        for buffers in _stream_batches(stream_id, view, chunk_size):
+            await self._send(buffers)
+    
+    async def send_file(self, stream_id, file, offset: int, count: int,
+                        chunk_size: int = 1_048_576):
+        """
+        Send count bytes of file (from offset) as DATA frames plus FRAME_END
+        
+        Payloads go out with os.sendfile() straight from the page cache when
+        the loop and transport support it (plain TCP on asyncio's own loops).
+        Otherwise (TLS, uvloop) each chunk is read with os.pread() at its
+        offset and written like any other frame.
+        """
+        while self._file_done is not None:
+            await self._file_done
+        
+        loop = asyncio.get_running_loop()
+        self._file_done = loop.create_future()
+        try:
+            fd = file.fileno()
+            # TLS must encrypt in user space - no os.sendfile() there
+            native = self.transport.get_extra_info('sslcontext') is None
+            seq = 0
+            sent = 0
+            while sent < count:
+                if self.transport.is_closing():
+                    raise ConnectionError("Connection closed")
+                size = min(chunk_size, count - sent)
+                self.transport.write(pack_header(FRAME_DATA, stream_id, seq, size))
+                if native:
+                    try:
+                        n = await loop.sendfile(self.transport, file, offset + sent, size,
+                                                fallback=False)
+                    except (NotImplementedError, RuntimeError):
+                        # No native sendfile for this loop/transport (uvloop;
+                        # asyncio raises RuntimeError/SendfileNotAvailableError)
+                        # - raised before anything is sent, so the header just
+                        # written is followed by the pread() payload below
+                        native = False
+                    else:
+                        if n != size:
+                            raise ConnectionError(f"sendfile sent {n} of {size} bytes")
+                if not native:
+                    # Explicit offset: the shared file position is never used
+                    payload = os.pread(fd, size, offset + sent)
+                    if len(payload) != size:
+                        raise ConnectionError(
+                            f"File ended at {offset + sent + len(payload)}, "
+                            f"{offset + count} expected")
+                    self.transport.write(payload)
+                    writable = self.protocol.writable
+                    if not writable.is_set():
+                        try:
+                            async with _timeout(10.0):
+                                await writable.wait()
+                        except asyncio.TimeoutError:
+                            raise ConnectionError("Send timeout - peer may be dead")
+                sent += size
+                seq += 1
+            self.transport.write(pack_header(FRAME_END, stream_id, seq, 0))
+        finally:
+            self._file_done.set_result(None)
+            self._file_done = None
+    
+    async def _send(self, buffers):
+        """Write buffers in one call; wait if the transport is backed up"""
+        while self._inflight >= self._max_inflight:
+            self._send_ready.clear()
+            await self._send_ready.wait()
+        
+        self._inflight += 1
         try:
-            header = await asyncio.wait_for(
-                self.reader.readexactly(HEADER_SIZE),
-                timeout=30.0
-            )
-            version, frame_type, stream_id, seq, length = decode_header(header)
+            while self._file_done is not None:
+                await self._file_done
+            if self.transport.is_closing():
+                raise ConnectionError("Connection closed")
             
-            payload = await asyncio.wait_for(
-                self.reader.readexactly(length),
-                timeout=30.0
-            )
+            self.transport.writelines(buffers)
             
-            return frame_type, stream_id, seq, payload
-        except asyncio.TimeoutError:
-            raise ConnectionError("Receive timeout")
+            # Only wait when the transport is above its high water mark
+            writable = self.protocol.writable
+            if not writable.is_set():
+                try:
+                    async with _timeout(10.0):
+                        await writable.wait()
+                except asyncio.TimeoutError:
+                    raise ConnectionError("Send timeout - peer may be dead")
+        finally:
+            self._inflight -= 1
+            self._send_ready.set()
+    
+    async def recv_frame(self):
+        """Receive frame with timeout"""
+        frames = self.protocol.frames
+        if frames.empty():
+            try:
+                async with _timeout(30.0):
+                    frame = await frames.get()
+            except asyncio.TimeoutError:
+                raise ConnectionError("Receive timeout")
+        else:
+            frame = frames.get_nowait()
+        
+        if frame is None:
+            frames.put_nowait(None)  # keep later readers failing too
+            raise ConnectionError("Connection closed")
+        self.protocol.frame_consumed()
+        return frame
+    
+    def release(self, payload):
+        """Return a received payload buffer for reuse (do not touch it after)"""
+        pool = self.protocol.pool
+        if isinstance(payload, bytearray) and len(pool) < RECV_POOL_SIZE:
+            pool.append(payload)
     
     async def close(self):
         """Close connection"""
         try:
-            self.writer.close()
-            await self.writer.wait_closed()
+            self.transport.close()
+            await self.protocol.closed
         except Exception:
             pass
 
@@ -84,7 +557,10 @@ class NodeReady:
              enable_discovery: bool = None,
              node_id: Optional[str] = None,
              host: str = "0.0.0.0",
-             port: int = 9000):
+             port: int = 9000,
+             collect_received: bool = False,
+             sndbuf: int = SOCKET_SNDBUF,
+             rcvbuf: int = SOCKET_RCVBUF):
         """
         Args:
             community: Cluster name
@@ -94,6 +570,11 @@ class NodeReady:
             node_id: UUID string
             host: Listen host
             port: Listen port
+            collect_received: Keep received stream payloads for
+                receive_stream() (default: count and drop them)
+            sndbuf, rcvbuf: Peer socket buffer sizes in bytes - size them to
+                the link's bandwidth-delay product. Linux caps them at
+                net.core.wmem_max / rmem_max, so raise those sysctls too
         """
         # UUID handling
         if node_id is None:
@@ -106,8 +587,10 @@ class NodeReady:
         
         self.host = host
         self.port = port
+        self._buffer_sizes = (sndbuf, rcvbuf)
         self.community = community
         self.api_key = api_key.encode() if isinstance(api_key, str) else api_key
+        self._mac_template = handshake_mac_template(self.api_key)
         
         # Static peers
         self.static_peers = static_peers or []
@@ -135,16 +618,54 @@ class NodeReady:
         )
         
         # Peer connections
-        self.peers = {}  # node_id_bytes -> Connection
-        self._peers_lock = asyncio.Lock()
+        # Copy-on-write: both tables are replaced, never mutated, so readers
+        # use whatever dict they grabbed without a lock (all writes happen on
+        # the event loop thread with no await in between)
+        self.peers = {}  # node_id_bytes -> Connection (identified by HELLO)
+        self._pending_by_addr = {}  # (host, port) -> Connection we dialed
+        self._dialed_by_id = {}     # node_id_bytes -> Connection we dialed
+        
+        # UUID string forms, filled in once per peer at handshake
+        self._peer_uuid_str = {}     # node_id_bytes -> "xxxxxxxx-..."
+        self._peer_bytes_by_str = {} # "xxxxxxxx-..." -> node_id_bytes
+        
+        # Set (and replaced) each time a peer identifies - wakes wait_for_peers()
+        self._peers_changed = asyncio.Event()
         
         # Session tokens
         self._session_tokens = {}
         self._tokens_lock = asyncio.Lock()
         
+        # TLS sessions for resumption on reconnect: (host, port) -> SSLSession
+        self._tls_sessions = {}
+        
+        # Failed-dial backoff: (host, port) -> (delay, retry_at monotonic time)
+        self._backoff = {}
+        
         # Stream ID management
-        self._next_stream_id = 1
-        self._stream_id_lock = asyncio.Lock()
+        # Odd numbers only; no lock - next() never yields to the event loop
+        self._stream_ids = itertools.count(1, 2)
+        
+        # Received stream completion, keyed by (node_id_bytes, stream_id) -
+        # every peer numbers its streams from 1, so stream IDs are only
+        # unique per sender. Recently finished keys (set for lookups, deque
+        # for age order), and futures for waiters that beat FRAME_END
+        self._stream_done = set()
+        self._stream_done_order = collections.deque()
+        self._stream_waiters = {}
+        
+        # Received payloads (collect_received only): streams in progress,
+        # and completed ones waiting for receive_stream()
+        self.collect_received = collect_received
+        self._receiving = {}  # (node_id_bytes, stream_id) -> bytearray
+        self._received = {}   # (node_id_bytes, stream_id) -> bytearray
+        
+        # Outbound dials in progress, and a cap on how many run at once
+        self._dialing = set()  # (host, port)
+        self._dial_sem = asyncio.Semaphore(MAX_CONCURRENT_DIALS)
+        
+        # Per-static-peer supervisor tasks (cancelled on shutdown)
+        self._static_tasks = []
         
         # Server reference for shutdown
         self._server = None
@@ -158,16 +679,79 @@ class NodeReady:
             verify_peer=verify_peer,
             is_server=True  # This node accepts connections
         )
+        # ...and dials them: outbound needs a client-side context
+        self.client_ssl_context = setup_tls(
+            tls=tls,
+            cert_file=cert_file,
+            key_file=key_file,
+            ca_file=ca_file,
+            verify_peer=verify_peer,
+            is_server=False
+        )
         
         if self.ssl_context:
             print(f"🔒 TLS enabled")
     
-    async def _get_next_stream_id(self) -> int:
+    def _get_next_stream_id(self) -> int:
         """Get auto-incrementing stream ID"""
-        async with self._stream_id_lock:
-            sid = self._next_stream_id
-            self._next_stream_id += 2  # Odd numbers only
-            return sid
+        return next(self._stream_ids)
+    
+    async def wait_stream_complete(self, peer_id: Union[str, bytes], stream_id: int):
+        """
+        Wait until FRAME_END for peer_id's stream_id has been received
+        
+        Returns at once if it already has (among the last
+        STREAM_DONE_HISTORY streams), no matter how often it is called.
+        """
+        key = (self._peer_id_bytes(peer_id), stream_id)
+        if key in self._stream_done:
+            return
+        done = self._stream_waiters.get(key)
+        if done is None:
+            done = self._stream_waiters[key] = asyncio.get_running_loop().create_future()
+        # Shielded: a cancelled waiter (e.g. wait_for timeout) leaves the
+        # future for FRAME_END and any other waiters
+        await asyncio.shield(done)
+    
+    async def receive_stream(self, peer_id: Union[str, bytes], stream_id: int) -> bytearray:
+        """
+        Wait for peer_id's stream_id to complete and return its payload
+        (needs collect_received; each payload can be received once)
+        """
+        if not self.collect_received:
+            raise RuntimeError("receive_stream() needs NodeReady(collect_received=True)")
+        peer_id_bytes = self._peer_id_bytes(peer_id)
+        await self.wait_stream_complete(peer_id_bytes, stream_id)
+        payload = self._received.pop((peer_id_bytes, stream_id), None)
+        if payload is None:
+            raise RuntimeError(f"Stream {stream_id} was already received")
+        return payload
+    
+    def _collect(self, peer_id_bytes: bytes, stream_id: int, payload):
+        """Append a DATA payload to its stream's buffer"""
+        key = (peer_id_bytes, stream_id)
+        buf = self._receiving.get(key)
+        if buf is None:
+            buf = self._receiving[key] = bytearray()
+        buf += payload
+    
+    def _stream_finished(self, peer_id_bytes: bytes, stream_id: int):
+        """FRAME_END: hand the payload over and wake waiters"""
+        key = (peer_id_bytes, stream_id)
+        if self.collect_received:
+            self._received[key] = self._receiving.pop(key, bytearray())
+        
+        if key not in self._stream_done:
+            self._stream_done.add(key)
+            self._stream_done_order.append(key)
+            if len(self._stream_done_order) > STREAM_DONE_HISTORY:
+                old_key = self._stream_done_order.popleft()
+                self._stream_done.discard(old_key)
+                self._received.pop(old_key, None)
+        
+        done = self._stream_waiters.pop(key, None)
+        if done is not None:
+            done.set_result(None)
     
     async def start(self):
         """Start node"""
@@ -187,14 +771,22 @@ class NodeReady:
         asyncio.create_task(self._start_server())
         
         if self._static_peer_addrs:
-            asyncio.create_task(self._static_connector())
+            self._static_tasks = [
+                asyncio.create_task(self._supervise_peer(host, port))
+                for host, port in self._static_peer_addrs
+            ]
         elif self.enable_discovery:
             asyncio.create_task(self._discovery_connector())
     
     async def _start_server(self):
         """Start TCP server with proper shutdown support"""
-        self._server = await asyncio.start_server(
-            self._handle_client,
+        loop = asyncio.get_running_loop()
+        # One process per node: peers, session tokens and stream IDs live in
+        # this loop, so SO_REUSEPORT workers would each see only the peers
+        # the kernel happened to hand them. Scale out with one node per core
+        # (distinct ports) instead.
+        self._server = await loop.create_server(
+            lambda: FrameProtocol(self._on_inbound, self._buffer_sizes),
             self.host,
             self.port,
             reuse_address=True,
@@ -202,222 +794,378 @@ class NodeReady:
             ssl=self.ssl_context  # ← ADD THIS LINE
         )
         
+        # Accepted sockets inherit TCP_NODELAY and SO_RCVBUF, so they are in
+        # place before the TLS handshake starts
+        for sock in self._server.sockets:
+            _configure_listener(sock, self._buffer_sizes[1])
+        
         try:
             async with self._server:
                 await self._server.serve_forever()
         except asyncio.CancelledError:
             pass
     
-    async def _handle_client(self, reader, writer):
+    def _on_inbound(self, conn: Connection):
+        """FrameProtocol callback for each accepted connection"""
+        asyncio.create_task(self._handle_client(conn))
+    
+    async def _handle_client(self, conn: Connection):
         """Handle incoming connection"""
-        conn = Connection(reader, writer)
-        
         try:
-            frame_type, stream_id, seq, payload = await asyncio.wait_for(
-                conn.recv_frame(),
-                timeout=10.0
-            )
+            # No admission gate: TLS is done by now, and what's left is a
+            # network wait plus a microsecond MAC check - a gate held across
+            # that wait would let a few silent connections lock peers out
+            async with _timeout(10.0):
+                frame_type, stream_id, seq, payload = await conn.recv_frame()
             
-            if frame_type != FRAME_HELLO or not verify_hello(payload, self.api_key):
+            if frame_type != FRAME_HELLO or not verify_hello(payload, self.api_key, self._mac_template):
                 await conn.close()
                 return
             
             peer_id_bytes, _, _ = decode_hello(payload)
             
             # Generate session token
-            accept_payload, session_token = encode_accept(self.api_key)
+            accept_payload, session_token = encode_accept(self.node_id_bytes, self.api_key,
+                                                          self._mac_template)
             await conn.send_frame(FRAME_ACCEPT, 0, 0, accept_payload)
             
             # Store connection
-            async with self._peers_lock:
-                self.peers[peer_id_bytes] = conn
+            peer_name = self._remember_peer(peer_id_bytes)
+            self.peers = {**self.peers, peer_id_bytes: conn}
+            self._peers_changed.set()
+            self._peers_changed = asyncio.Event()
             
             async with self._tokens_lock:
                 self._session_tokens[peer_id_bytes] = session_token
             
-            peer_uuid = bytes_to_uuid(peer_id_bytes)
-            print(f"✓ Connected from: {str(peer_uuid)[:8]}")
+            print(f"✓ Connected from: {peer_name[:8]}")
             
             asyncio.create_task(self._recv_loop(conn, peer_id_bytes))
             
         except Exception as e:
             await conn.close()
     
-    async def _static_connector(self):
-        """Connect to static peers"""
+    def _remember_peer(self, peer_id_bytes: bytes) -> str:
+        """Cache the UUID string for a peer ID; returns it"""
+        name = self._peer_uuid_str.get(peer_id_bytes)
+        if name is None:
+            name = str(bytes_to_uuid(peer_id_bytes))
+            self._peer_uuid_str[peer_id_bytes] = name
+            self._peer_bytes_by_str[name] = peer_id_bytes
+        return name
+    
+    async def _supervise_peer(self, host: str, port: int):
+        """Keep one static peer connected: dial, wait for disconnect, back off"""
         while self._running:
-            for host, port in self._static_peer_addrs:
-                asyncio.create_task(self._connect_peer(host, port))
-            await asyncio.sleep(10)
+            recv_task = await self._connect_peer(host, port)
+            if recv_task is not None:
+                # Connected - nothing to do until the connection drops; the
+                # receive loop then updates the backoff for the wait below
+                await asyncio.wait({recv_task})
+            
+            backoff = self._backoff.get((host, port))
+            delay = backoff[1] - time.monotonic() if backoff else RECONNECT_BACKOFF_INITIAL
+            await asyncio.sleep(max(0.0, delay))
     
     async def _discovery_connector(self):
         """Connect to discovered peers"""
         while self._running:
-            discovered = await self.discovery.get_peers()
+            discovered = self.discovery.get_peers()
             
             for peer_id_bytes, (ip, port) in discovered.items():
-                async with self._peers_lock:
-                    if peer_id_bytes in self.peers:
-                        continue
+                if peer_id_bytes in self.peers:
+                    continue
                 
                 asyncio.create_task(self._connect_peer(ip, port))
             
             await asyncio.sleep(2)
     
     async def _connect_peer(self, host: str, port: int):
-        """Connect to specific peer"""
+        """
+        Connect to specific peer
+        
+        Returns:
+            The connection's receive-loop task, or None if not connected
+        """
+        key = (host, port)
+        if key in self._dialing or key in self._pending_by_addr:
+            # Already dialing / connected - don't stack another attempt
+            return None
+        
+        backoff = self._backoff.get(key)
+        if backoff is not None and time.monotonic() < backoff[1]:
+            return None
+        
+        self._dialing.add(key)
+        try:
+            async with self._dial_sem:
+                return await self._dial_peer(host, port)
+        finally:
+            self._dialing.discard(key)
+    
+    async def _dial_peer(self, host: str, port: int):
+        """Open the connection and run the HELLO/ACCEPT exchange"""
+        ssl_context = self.client_ssl_context
+        session = self._tls_sessions.get((host, port))
+        if session is not None:
+            ssl_context = _ResumingContext(ssl_context, session)
+        
         try:
-            reader, writer = await asyncio.wait_for(
-                asyncio.open_connection(
+            loop = asyncio.get_running_loop()
+            async with _timeout(5.0):
+                transport, protocol = await loop.create_connection(
+                    lambda: FrameProtocol(buffer_sizes=self._buffer_sizes),
                     host, port,
-                    ssl=self.ssl_context  # ← ADD THIS LINE
-                ),
-                timeout=5.0
-            )
+                    ssl=ssl_context
+                )
             
-            conn = Connection(reader, writer)
+            conn = protocol.connection
             
             # Send HELLO
-            hello_payload = encode_hello(self.node_id_bytes, self.api_key)
+            hello_payload = encode_hello(self.node_id_bytes, self.api_key,
+                                         mac_template=self._mac_template)
             await conn.send_frame(FRAME_HELLO, 0, 0, hello_payload)
             
             # Wait for ACCEPT
-            frame_type, stream_id, seq, payload = await asyncio.wait_for(
-                conn.recv_frame(),
-                timeout=10.0
-            )
+            async with _timeout(10.0):
+                frame_type, stream_id, seq, payload = await conn.recv_frame()
             
             if frame_type != FRAME_ACCEPT:
                 await conn.close()
-                return
+                self._connect_failed(host, port)
+                return None
             
-            session_token = decode_accept(payload, self.api_key)
-            if not session_token:
+            accepted = decode_accept(payload, self.api_key, self._mac_template)
+            if not accepted:
                 await conn.close()
-                return
+                self._connect_failed(host, port)
+                return None
+            peer_id_bytes, session_token = accepted
             
-            # We need to get peer's ID - it was in their HELLO
-            # For now, we'll track by connection and discover on first recv
-            # Store temporarily with connection object as key
-            async with self._peers_lock:
-                # Check if already connected (by checking all peer_ids)
-                # This is a simplified version - production would handle this better
-                self.peers[f"temp_{host}:{port}".encode()] = conn
+            # TLS 1.3 tickets arrive after the handshake; by the time ACCEPT has
+            # been read the session is resumable
+            ssl_object = transport.get_extra_info('ssl_object')
+            if ssl_object is not None and ssl_object.session is not None:
+                self._tls_sessions[(host, port)] = ssl_object.session
+            
+            # Outbound connections stay out of self.peers (the peer's own
+            # inbound one goes there); tracked by address for redialing and
+            # by the responder's ID from ACCEPT for sending
+            self._remember_peer(peer_id_bytes)
+            self._pending_by_addr = {**self._pending_by_addr, (host, port): conn}
+            self._dialed_by_id = {**self._dialed_by_id, peer_id_bytes: conn}
             
             print(f"✓ Connected to: {host}:{port}")
             
-            asyncio.create_task(self._recv_loop_temp(conn, host, port))
+            return asyncio.create_task(self._recv_loop_temp(conn, host, port, peer_id_bytes))
             
         except (asyncio.TimeoutError, ConnectionRefusedError):
-            pass
-        except Exception:
-            pass
+            # Peer not up yet - silent, but back off
+            self._connect_failed(host, port)
+        except Exception as e:
+            print(f"⚠️  Error connecting to {host}:{port}: {e}")
+            self._connect_failed(host, port)
+        return None
+    
+    def _connect_failed(self, host: str, port: int):
+        """Double the retry delay for this address (capped)"""
+        delay, _ = self._backoff.get((host, port), (RECONNECT_BACKOFF_INITIAL / 2, 0))
+        delay = min(RECONNECT_BACKOFF_MAX, delay * 2)
+        self._backoff[(host, port)] = (delay, time.monotonic() + delay)
     
-    async def _recv_loop_temp(self, conn, host, port):
-        """Temporary recv loop until we know peer ID"""
+    async def _recv_loop_temp(self, conn, host, port, peer_id_bytes):
+        """Receive loop for a connection we dialed"""
+        connected_at = time.monotonic()
         try:
-            # First frame will tell us the peer ID
-            # In production, this would be part of handshake
             while self._running:
                 frame_type, stream_id, seq, payload = await conn.recv_frame()
                 
                 if frame_type == FRAME_DATA:
-                    print(f"[{self.node_id[:8]}] recv stream {stream_id} "
-                          f"seq {seq} size={len(payload)} from {host}:{port}")
+                    if logger.isEnabledFor(logging.DEBUG):
+                        logger.debug("[%s] recv stream %d seq %d size=%d from %s:%d",
+                                     self.node_id[:8], stream_id, seq, len(payload), host, port)
+                    if self.collect_received:
+                        self._collect(peer_id_bytes, stream_id, payload)
+                    conn.release(payload)
                 elif frame_type == FRAME_END:
-                    print(f"[{self.node_id[:8]}] stream {stream_id} complete")
+                    self._stream_finished(peer_id_bytes, stream_id)
+                    logger.debug("[%s] stream %d complete", self.node_id[:8], stream_id)
         except Exception:
             pass
         finally:
-            async with self._peers_lock:
-                temp_key = f"temp_{host}:{port}".encode()
-                if temp_key in self.peers:
-                    del self.peers[temp_key]
+            if self._pending_by_addr.get((host, port)) is conn:
+                self._pending_by_addr = {
+                    k: c for k, c in self._pending_by_addr.items() if c is not conn
+                }
+            if self._dialed_by_id.get(peer_id_bytes) is conn:
+                self._dialed_by_id = {
+                    k: c for k, c in self._dialed_by_id.items() if c is not conn
+                }
+            # Backoff only resets once a connection has proved stable
+            if time.monotonic() - connected_at >= RECONNECT_STABLE_SECS:
+                self._backoff.pop((host, port), None)
+            else:
+                self._connect_failed(host, port)
             await conn.close()
     
     async def _recv_loop(self, conn: Connection, peer_id_bytes: bytes):
         """Receive loop for known peer"""
         try:
-            peer_uuid = bytes_to_uuid(peer_id_bytes)
+            peer_prefix = self._remember_peer(peer_id_bytes)[:8]
             
             while self._running:
                 frame_type, stream_id, seq, payload = await conn.recv_frame()
                 
                 if frame_type == FRAME_DATA:
-                    print(f"[{self.node_id[:8]}] recv stream {stream_id} "
-                          f"seq {seq} size={len(payload)} from {str(peer_uuid)[:8]}")
+                    if logger.isEnabledFor(logging.DEBUG):
+                        logger.debug("[%s] recv stream %d seq %d size=%d from %s",
+                                     self.node_id[:8], stream_id, seq, len(payload), peer_prefix)
+                    if self.collect_received:
+                        self._collect(peer_id_bytes, stream_id, payload)
+                    conn.release(payload)
                 elif frame_type == FRAME_END:
-                    print(f"[{self.node_id[:8]}] stream {stream_id} complete")
+                    self._stream_finished(peer_id_bytes, stream_id)
+                    logger.debug("[%s] stream %d complete", self.node_id[:8], stream_id)
         except Exception:
             pass
         finally:
-            async with self._peers_lock:
-                if peer_id_bytes in self.peers:
-                    del self.peers[peer_id_bytes]
+            if self.peers.get(peer_id_bytes) is conn:
+                self.peers = {k: c for k, c in self.peers.items() if c is not conn}
             await conn.close()
     
     async def stream_tensor(self,
-                           peer_id: str,
-                           data: bytes,
+                           peer_id: Union[str, bytes],
+                           data: Union[bytes, bytearray, memoryview],
                            tensor_id: int = None,
-                           chunk_size: int = 1_048_576):
-        """Stream tensor to peer"""
+                           chunk_size: int = 1_048_576) -> int:
+        """
+        Stream tensor to peer
+        
+        Frames are views into data (never copied), so the same buffer can
+        be sent to any number of peers at once.
+        
+        Returns:
+            The stream ID used (pass to the receiver's wait_stream_complete)
+        """
         
         # Auto-assign stream ID if not provided
         if tensor_id is None:
-            tensor_id = await self._get_next_stream_id()
+            tensor_id = self._get_next_stream_id()
         
-        # Convert UUID string to bytes
-        peer_uuid = uuid_module.UUID(peer_id)
-        peer_id_bytes = uuid_to_bytes(peer_uuid)
+        conn = self._peer_connection(peer_id)
         
-        async with self._peers_lock:
-            conn = self.peers.get(peer_id_bytes)
-            if not conn:
-                # Try temp keys (static peers)
-                for key, c in self.peers.items():
-                    if c:
-                        conn = c
-                        break
+        # Zero-copy chunk views, written in batches with the END frame
+        await conn.send_stream(tensor_id, data, chunk_size)
+        return tensor_id
+    
+    async def broadcast_tensor(self,
+                               peer_ids: List[Union[str, bytes]],
+                               data: Union[bytes, bytearray, memoryview],
+                               tensor_id: int = None,
+                               chunk_size: int = 1_048_576) -> int:
+        """
+        Stream the same tensor to several peers
         
-        if not conn:
-            raise RuntimeError(f"No connection to peer {peer_id}")
+        Frames are packed once and each batch is written to every peer in
+        turn from one coroutine, so a peer only holds the others up while
+        its transport is over the high water mark.
         
-        seq = 0
-        for i in range(0, len(data), chunk_size):
-            chunk = data[i:i+chunk_size]
-            await conn.send_frame(FRAME_DATA, tensor_id, seq, chunk)
-            seq += 1
+        Returns:
+            The stream ID used (the same on every peer)
+        """
+        if tensor_id is None:
+            tensor_id = self._get_next_stream_id()
         
-        await conn.send_frame(FRAME_END, tensor_id, seq, b"")
+        conns = [self._peer_connection(peer_id) for peer_id in peer_ids]
+        if conns:
+            for buffers in _stream_batches(tensor_id, memoryview(data), chunk_size):
+                for conn in conns:
+                    await conn._send(buffers)
+        return tensor_id
+    
+    async def stream_tensor_from_fd(self,
+                                    peer_id: Union[str, bytes],
+                                    fobj,
+                                    length: int,
+                                    tensor_id: int = None,
+                                    offset: int = 0,
+                                    chunk_size: int = 1_048_576) -> int:
+        """
+        Stream length bytes of a file to peer without copying them through
+        Python (os.sendfile on plain TCP; pread() and write elsewhere)
+        
+        Args:
+            fobj: Regular file opened in binary mode
+            offset: Where in the file the tensor starts
+        
+        Returns:
+            The stream ID used (pass to the receiver's wait_stream_complete)
+        """
+        if tensor_id is None:
+            tensor_id = self._get_next_stream_id()
+        
+        conn = self._peer_connection(peer_id)
+        await conn.send_file(tensor_id, fobj, offset, length, chunk_size)
+        return tensor_id
+    
+    def _peer_id_bytes(self, peer_id: Union[str, bytes]) -> bytes:
+        """16-byte form of a peer ID"""
+        # Accept raw 16-byte IDs; strings from get_peer_ids() skip the parse
+        if isinstance(peer_id, bytes):
+            return peer_id
+        peer_id_bytes = self._peer_bytes_by_str.get(peer_id)
+        if peer_id_bytes is None:
+            peer_id_bytes = uuid_to_bytes(uuid_module.UUID(peer_id))
+        return peer_id_bytes
+    
+    def _peer_connection(self, peer_id: Union[str, bytes]) -> Connection:
+        """Connection to send to peer_id on; RuntimeError if there is none"""
+        peer_id_bytes = self._peer_id_bytes(peer_id)
+        
+        # Their connection to us if they have one, else the one we dialed
+        conn = self.peers.get(peer_id_bytes) or self._dialed_by_id.get(peer_id_bytes)
+        
+        if not conn:
+            raise RuntimeError(f"No connection to peer {peer_id}")
+        return conn
+    
+    async def wait_for_peers(self, peer_ids: List[str]):
+        """Wait until every peer in peer_ids has connected (no polling)"""
+        wanted = {uuid_to_bytes(uuid_module.UUID(p)) for p in peer_ids}
+        while not wanted.issubset(self.peers):
+            await self._peers_changed.wait()
     
     def get_peer_ids(self) -> list[str]:
         """Get list of connected peer UUIDs"""
-        peer_ids = []
-        for peer_id_bytes in self.peers.keys():
-            if not isinstance(peer_id_bytes, bytes) or peer_id_bytes.startswith(b"temp_"):
-                continue
-            try:
-                peer_ids.append(str(bytes_to_uuid(peer_id_bytes)))
-            except:
-                pass
-        return peer_ids
+        names = self._peer_uuid_str
+        return [names[peer_id_bytes] for peer_id_bytes in self.peers]
     
     async def shutdown(self):
         """Graceful shutdown"""
         print(f"\nShutting down {self.node_id[:8]}")
         self._running = False
         
+        # Stop static peer supervisors
+        for task in self._static_tasks:
+            task.cancel()
+        self._static_tasks = []
+        
+        # Stop announcing ourselves
+        if self.enable_discovery:
+            self.discovery.stop()
+        
         # Close server
         if self._server:
             self._server.close()
             await self._server.wait_closed()
         
         # Close all connections
-        async with self._peers_lock:
-            for conn in list(self.peers.values()):
-                try:
-                    await conn.close()
-                except:
-                    pass
-            self.peers.clear()
+        conns = [*self.peers.values(), *self._pending_by_addr.values()]
+        self.peers = {}
+        self._pending_by_addr = {}
+        self._dialed_by_id = {}
+        for conn in conns:
+            try:
+                await conn.close()
+            except:
+                pass
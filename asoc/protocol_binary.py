@@ -2,8 +2,13 @@ import struct
 import secrets
 import hmac
 import hashlib
+import functools
+from typing import Optional
 
-VERSION = 1
+# Frame header version. 2: keyed BLAKE2s handshake tags (1 used
+# HMAC-SHA256) and the responder's ID in ACCEPT - frames from other
+# versions are rejected at header decode
+VERSION = 2
 
 # Frame types (1 byte)
 FRAME_DATA = 1
@@ -17,25 +22,89 @@ FRAME_ACCEPT = 5
 HEADER_FMT = "!BBIII"
 HEADER_SIZE = 14
 
+# Precompiled layouts (format string parsed once, not per call)
+_HEADER = struct.Struct(HEADER_FMT)
+_U16 = struct.Struct('!H')
+_U32 = struct.Struct('!I')
+_HELLO = struct.Struct('!16s16sI')          # node_id | signature | challenge
+_ACCEPT = struct.Struct('!16s8s8s')         # node_id | session_token | signature
+_DISCOVERY_TAIL = struct.Struct('!II')      # timestamp | challenge
+_DISCOVERY_FIELDS = struct.Struct('!HII')   # port | timestamp | challenge
+_SEAL_NONCE = struct.Struct('!4xQ')         # zero pad | frame counter
+
+def encode_header(frame_type, stream_id, seq, length: int) -> bytes:
+    """Encode just the 14-byte frame header (send payload separately)"""
+    return _HEADER.pack(VERSION, frame_type, stream_id, seq, length)
+
+# Same as encode_header, minus the Python call frame (~25% cheaper per
+# call) - for per-frame send paths
+pack_header = functools.partial(_HEADER.pack, VERSION)
+
 def encode_frame(frame_type, stream_id, seq, payload: bytes):
     """Encode a frame - pure binary, no strings"""
-    header = struct.pack(HEADER_FMT, VERSION, frame_type, stream_id, seq, len(payload))
-    return header + payload
+    return encode_header(frame_type, stream_id, seq, len(payload)) + payload
 
 def decode_header(data: bytes):
     """Decode frame header"""
-    return struct.unpack(HEADER_FMT, data)
+    return _HEADER.unpack(data)
+
+def decode_header_from(buffer, offset: int = 0):
+    """Decode frame header in place from a larger receive buffer"""
+    return _HEADER.unpack_from(buffer, offset)
+
+
+# ============================================================================
+# Handshake MAC helpers
+# ============================================================================
+
+# BLAKE2s personalization for HELLO/ACCEPT tags, keeping them distinct
+# from discovery tags made with the same key
+HANDSHAKE_PERSON = b"asoc-hs"
+
+def _blake2s_key(api_key: bytes) -> bytes:
+    """Keys longer than BLAKE2s' 32-byte limit are hashed down first"""
+    if len(api_key) > 32:
+        return hashlib.blake2s(api_key).digest()
+    return api_key
+
+def handshake_mac_template(api_key: bytes):
+    """
+    Keyed BLAKE2s state for HELLO/ACCEPT tags, to .copy() per message
+    
+    Pass as mac_template= to the HELLO/ACCEPT functions so the key block
+    is compressed once rather than per message.
+    """
+    return hashlib.blake2s(key=_blake2s_key(api_key), digest_size=16,
+                           person=HANDSHAKE_PERSON)
+
+def _handshake_mac(api_key: bytes, data: bytes, template=None) -> bytes:
+    """
+    16-byte keyed BLAKE2s tag for handshake messages
+    
+    One compression call for these short inputs, instead of HMAC-SHA256's
+    inner and outer passes.
+    """
+    h = _handshake_mac_state(api_key, template)
+    h.update(data)
+    return h.digest()
+
+def _handshake_mac_state(api_key: bytes, template=None):
+    """Fresh handshake MAC state to feed message pieces into"""
+    if template is None:
+        return handshake_mac_template(api_key)
+    return template.copy()
 
 
 # ============================================================================
 # HELLO Frame (36 bytes total)
 # ============================================================================
 # node_id: 16 bytes (UUID as binary, not string!)
-# api_key_proof: 16 bytes (HMAC-SHA256 truncated to 128 bits)
+# api_key_proof: 16 bytes (keyed BLAKE2s, 128-bit tag)
 # challenge: 4 bytes (random uint32)
 # ============================================================================
 
-def encode_hello(node_id_bytes: bytes, api_key: bytes, challenge: int = None) -> bytes:
+def encode_hello(node_id_bytes: bytes, api_key: bytes, challenge: int = None,
+                 mac_template=None) -> bytes:
     """
     Encode HELLO frame
     
@@ -43,9 +112,10 @@ def encode_hello(node_id_bytes: bytes, api_key: bytes, challenge: int = None) ->
         node_id_bytes: 16 bytes UUID (use uuid.uuid4().bytes)
         api_key: API key bytes
         challenge: Optional challenge (auto-generated if None)
+        mac_template: Optional handshake_mac_template(api_key) to sign with
     
     Returns:
-        36 bytes: node_id(16) + hmac(16) + challenge(4)
+        36 bytes: node_id(16) + mac(16) + challenge(4)
     """
     if len(node_id_bytes) != 16:
         raise ValueError("node_id must be 16 bytes")
@@ -53,11 +123,11 @@ def encode_hello(node_id_bytes: bytes, api_key: bytes, challenge: int = None) ->
     if challenge is None:
         challenge = secrets.randbits(32)
     
-    # Create HMAC proof (truncate to 16 bytes for compactness)
-    data = node_id_bytes + struct.pack('!I', challenge)
-    signature = hmac.new(api_key, data, hashlib.sha256).digest()[:16]
+    # Create MAC proof of the API key
+    data = node_id_bytes + _U32.pack(challenge)
+    signature = _handshake_mac(api_key, data, mac_template)
     
-    return node_id_bytes + signature + struct.pack('!I', challenge)
+    return _HELLO.pack(node_id_bytes, signature, challenge)
 
 def decode_hello(payload: bytes) -> tuple[bytes, bytes, int]:
     """
@@ -69,64 +139,73 @@ def decode_hello(payload: bytes) -> tuple[bytes, bytes, int]:
     if len(payload) != 36:
         raise ValueError(f"HELLO payload must be 36 bytes, got {len(payload)}")
     
-    node_id = payload[:16]
-    signature = payload[16:32]
-    challenge = struct.unpack('!I', payload[32:36])[0]
-    
-    return node_id, signature, challenge
+    return _HELLO.unpack(payload)
 
-def verify_hello(payload: bytes, api_key: bytes) -> bool:
-    """Verify HELLO HMAC signature"""
-    node_id, signature, challenge = decode_hello(payload)
+def verify_hello(payload: bytes, api_key: bytes, mac_template=None) -> bool:
+    """Verify HELLO signature"""
+    if len(payload) != 36:
+        raise ValueError(f"HELLO payload must be 36 bytes, got {len(payload)}")
     
-    # Recompute HMAC
-    data = node_id + struct.pack('!I', challenge)
-    expected = hmac.new(api_key, data, hashlib.sha256).digest()[:16]
+    # Recompute MAC over node_id + challenge straight from the payload,
+    # without unpacking or re-packing the fields
+    view = memoryview(payload)
+    h = _handshake_mac_state(api_key, mac_template)
+    h.update(view[:16])
+    h.update(view[32:36])
     
-    return hmac.compare_digest(expected, signature)
+    return hmac.compare_digest(h.digest(), view[16:32])
 
 
 # ============================================================================
-# ACCEPT Frame (16 bytes total)
+# ACCEPT Frame (32 bytes total)
 # ============================================================================
+# node_id: 16 bytes (responder's UUID, so the dialer knows who it reached)
 # session_token: 8 bytes (random)
-# token_signature: 8 bytes (HMAC truncated)
+# token_signature: 8 bytes (keyed BLAKE2s of node_id + token, truncated)
 # ============================================================================
 
-def encode_accept(api_key: bytes) -> tuple[bytes, bytes]:
+def encode_accept(node_id_bytes: bytes, api_key: bytes,
+                  mac_template=None) -> tuple[bytes, bytes]:
     """
     Encode ACCEPT frame with session token
     
+    Args:
+        node_id_bytes: Responder's 16-byte UUID
+    
     Returns:
-        (payload, session_token) where payload is 16 bytes
+        (payload, session_token) where payload is 32 bytes
     """
+    if len(node_id_bytes) != 16:
+        raise ValueError("node_id must be 16 bytes")
+    
     # Generate random 8-byte token
     session_token = secrets.token_bytes(8)
     
-    # Sign it (truncate HMAC to 8 bytes)
-    signature = hmac.new(api_key, session_token, hashlib.sha256).digest()[:8]
+    # Sign ID + token (truncate tag to 8 bytes)
+    signature = _handshake_mac(api_key, node_id_bytes + session_token, mac_template)[:8]
     
-    payload = session_token + signature
+    payload = _ACCEPT.pack(node_id_bytes, session_token, signature)
     return payload, session_token
 
-def decode_accept(payload: bytes, api_key: bytes) -> bytes:
+def decode_accept(payload: bytes, api_key: bytes,
+                  mac_template=None) -> Optional[tuple[bytes, bytes]]:
     """
     Decode and verify ACCEPT frame
     
     Returns:
-        session_token (8 bytes) if valid, None if invalid
+        (node_id_bytes, session_token) if valid, None if invalid
     """
-    if len(payload) != 16:
-        raise ValueError(f"ACCEPT payload must be 16 bytes, got {len(payload)}")
-    
-    session_token = payload[:8]
-    signature = payload[8:16]
+    if len(payload) != 32:
+        raise ValueError(f"ACCEPT payload must be 32 bytes, got {len(payload)}")
     
-    # Verify signature
-    expected = hmac.new(api_key, session_token, hashlib.sha256).digest()[:8]
+    # Verify signature on the ID + token bytes in place; only copy them
+    # out once it checks
+    view = memoryview(payload)
+    h = _handshake_mac_state(api_key, mac_template)
+    h.update(view[:24])
     
-    if hmac.compare_digest(expected, signature):
-        return session_token
+    if hmac.compare_digest(h.digest()[:8], view[24:32]):
+        return payload[:16], payload[16:24]
     return None
 
 
@@ -138,10 +217,62 @@ def decode_accept(payload: bytes, api_key: bytes) -> bytes:
 # port: 2 bytes (uint16)
 # timestamp: 4 bytes (uint32, seconds since epoch)
 # challenge: 4 bytes (uint32)
-# signature: 16 bytes (HMAC of above fields)
+# signature: 16 bytes (keyed BLAKE2s of above fields)
 # Total: 50 bytes (vs ~150 for JSON!)
 # ============================================================================
 
+@functools.lru_cache(maxsize=64)
+def community_hash(community: str) -> bytes:
+    """8-byte community hash: SHA256(community) truncated (cached)"""
+    return hashlib.sha256(community.encode()).digest()[:8]
+
+def discovery_mac_template(api_key: bytes):
+    """
+    Keyed BLAKE2s state for discovery tags, to .copy() per message
+    
+    Pass as mac_template= to the discovery functions so the key block is
+    compressed once rather than per message.
+    """
+    return hashlib.blake2s(key=_blake2s_key(api_key), digest_size=16)
+
+def _discovery_mac(api_key: bytes, message: bytes, template=None) -> bytes:
+    """
+    16-byte keyed BLAKE2s tag for discovery messages
+    
+    BLAKE2s is a MAC in keyed mode, so this is one compression call in C
+    instead of HMAC's inner+outer SHA-256 passes. Keys longer than
+    BLAKE2s' 32-byte limit are hashed down first.
+    """
+    if template is None:
+        template = discovery_mac_template(api_key)
+    h = template.copy()
+    h.update(message)
+    return h.digest()
+
+def discovery_prefix(community: str, node_id_bytes: bytes, port: int) -> bytes:
+    """
+    Build the constant 26-byte head of a node's discovery messages
+    
+    Returns:
+        community_hash(8) + node_id(16) + port(2)
+    """
+    return community_hash(community) + node_id_bytes + _U16.pack(port)
+
+def encode_discovery_prefixed(prefix: bytes, api_key: bytes,
+                              timestamp: int, challenge: int,
+                              mac_template=None) -> bytes:
+    """
+    Encode discovery message from a precomputed discovery_prefix()
+    
+    Only the 8 mutable bytes (timestamp + challenge) are packed per call.
+    mac_template is an optional discovery_mac_template(api_key).
+    
+    Returns:
+        50 bytes total
+    """
+    message = prefix + _DISCOVERY_TAIL.pack(timestamp, challenge)
+    return message + _discovery_mac(api_key, message, mac_template)
+
 def encode_discovery(community: str, node_id_bytes: bytes, port: int, 
                      api_key: bytes, timestamp: int = None, challenge: int = None) -> bytes:
     """
@@ -157,52 +288,43 @@ def encode_discovery(community: str, node_id_bytes: bytes, port: int,
     if challenge is None:
         challenge = secrets.randbits(32)
     
-    # Hash community string to 8 bytes
-    community_hash = hashlib.sha256(community.encode()).digest()[:8]
-    
-    # Pack all fields
-    message = (
-        community_hash +                    # 8 bytes
-        node_id_bytes +                     # 16 bytes
-        struct.pack('!H', port) +           # 2 bytes
-        struct.pack('!I', timestamp) +      # 4 bytes
-        struct.pack('!I', challenge)        # 4 bytes
+    return encode_discovery_prefixed(
+        discovery_prefix(community, node_id_bytes, port),
+        api_key, timestamp, challenge
     )
-    
-    # Sign it (truncate to 16 bytes)
-    signature = hmac.new(api_key, message, hashlib.sha256).digest()[:16]
-    
-    return message + signature
 
-def decode_discovery(payload: bytes, expected_community: str, api_key: bytes) -> dict:
+def decode_discovery(payload: bytes, expected_community, api_key: bytes,
+                     mac_template=None) -> dict:
     """
     Decode and verify discovery message
     
+    Args:
+        expected_community: Community string, or its precomputed 8-byte
+            community_hash() to skip the per-packet lookup
+    
     Returns:
         dict with parsed fields if valid, None if invalid
     """
     if len(payload) != 50:
         return None
     
-    # Parse fields
-    community_hash = payload[:8]
-    node_id = payload[8:24]
-    port = struct.unpack('!H', payload[24:26])[0]
-    timestamp = struct.unpack('!I', payload[26:30])[0]
-    challenge = struct.unpack('!I', payload[30:34])[0]
-    signature = payload[34:50]
-    
-    # Verify community
-    expected_hash = hashlib.sha256(expected_community.encode()).digest()[:8]
-    if not hmac.compare_digest(community_hash, expected_hash):
+    # Verify community first - foreign-community traffic is rejected
+    # before any parsing or MAC work (the hash is public, plain compare)
+    if isinstance(expected_community, str):
+        expected_community = community_hash(expected_community)
+    if not payload.startswith(expected_community):
         return None
     
-    # Verify signature
-    message = payload[:34]
-    expected_sig = hmac.new(api_key, message, hashlib.sha256).digest()[:16]
-    if not hmac.compare_digest(signature, expected_sig):
+    # Verify signature over a view of the signed bytes (no slice copies)
+    view = memoryview(payload)
+    expected_sig = _discovery_mac(api_key, view[:34], mac_template)
+    if not hmac.compare_digest(view[34:50], expected_sig):
         return None
     
+    # Parse fields
+    node_id = payload[8:24]
+    port, timestamp, challenge = _DISCOVERY_FIELDS.unpack_from(payload, 24)
+    
     return {
         'node_id': node_id,
         'port': port,
@@ -211,6 +333,132 @@ def decode_discovery(payload: bytes, expected_community: str, api_key: bytes) ->
     }
 
 
+# ============================================================================
+# Sealed DATA frames (optional, AEAD)
+# ============================================================================
+# Plain DATA frames rely on the authenticated connection (or TLS). Where
+# per-frame integrity is wanted, the payload is sealed with AES-128-GCM in
+# a single pass - encryption and tag together - rather than adding a
+# separate MAC pass over every chunk:
+#
+#   header(14, length = len(payload) + 16) | ciphertext | tag(16)
+#
+# The header is the associated data. Each session and direction gets its
+# own key, and the nonce is that direction's frame counter - not
+# (stream_id, seq), which callers choose and may repeat. The receiver keeps
+# the same count (TCP delivers in order), so a replayed, dropped or
+# reordered frame fails to open.
+# Requires the cryptography package (pip install asoc-protocol[tls]).
+# ============================================================================
+
+SEAL_TAG_SIZE = 16
+
+# BLAKE2s personalization for deriving sealed-frame keys
+SEAL_KEY_PERSON = b"asoc-dk"
+
+class SealedFrameCipher:
+    """
+    AES-GCM key for one direction of a session plus its frame counter
+    
+    Use one object per end: the sender's seals frames, the receiver's
+    opens them, and both count in step.
+    """
+    __slots__ = ("_aead", "_counter")
+    
+    def __init__(self, aead):
+        self._aead = aead
+        self._counter = 0
+    
+    def seal(self, payload: bytes, header: bytes) -> bytes:
+        """Encrypt payload with the next nonce; header is authenticated"""
+        nonce = _SEAL_NONCE.pack(self._counter)
+        self._counter += 1
+        return self._aead.encrypt(nonce, payload, header)
+    
+    def open(self, sealed: bytes, header: bytes) -> Optional[bytes]:
+        """Decrypt the next frame; None (counter unchanged) if not authentic"""
+        from cryptography.exceptions import InvalidTag
+        
+        try:
+            payload = self._aead.decrypt(_SEAL_NONCE.pack(self._counter), sealed, header)
+        except InvalidTag:
+            return None
+        self._counter += 1
+        return payload
+
+def data_frame_cipher(api_key: bytes, session_token: bytes,
+                      initiator: bool) -> SealedFrameCipher:
+    """
+    AES-GCM cipher for sealed frames in one direction of a session
+    
+    Args:
+        api_key: API key bytes
+        session_token: 8-byte token from ACCEPT
+        initiator: True for frames sent by the side that sent HELLO
+    
+    Raises:
+        ImportError: if the optional cryptography package is missing
+    """
+    from cryptography.hazmat.primitives.ciphers.aead import AESGCM
+    
+    key = hashlib.blake2s(session_token + (b"\x01" if initiator else b"\x02"),
+                          key=_blake2s_key(api_key), digest_size=16,
+                          person=SEAL_KEY_PERSON).digest()
+    return SealedFrameCipher(AESGCM(key))
+
+def encode_sealed_frame(frame_type: int, stream_id: int, seq: int,
+                        payload: bytes, cipher: SealedFrameCipher) -> tuple[bytes, bytes]:
+    """
+    Encode a frame whose payload is sealed with data_frame_cipher()
+    
+    Returns:
+        (header, sealed) - write both (e.g. writelines()), no joined copy
+    """
+    header = encode_header(frame_type, stream_id, seq, len(payload) + SEAL_TAG_SIZE)
+    return header, cipher.seal(payload, header)
+
+def decode_sealed_payload(header: bytes, sealed: bytes,
+                          cipher: SealedFrameCipher) -> Optional[bytes]:
+    """
+    Open a sealed frame payload
+    
+    Args:
+        header: The frame's 14 header bytes (authenticated, not encrypted)
+        sealed: Ciphertext + tag
+    
+    Returns:
+        Plaintext payload if authentic, None if not
+    """
+    return cipher.open(sealed, header)
+
+
+def sealed_frame_check():
+    """Round-trip and tamper check for sealed frames (needs cryptography)"""
+    api_key, token = b"check-key", secrets.token_bytes(8)
+    sender = data_frame_cipher(api_key, token, initiator=True)
+    receiver = data_frame_cipher(api_key, token, initiator=True)
+    
+    # Same (stream_id, seq) twice: distinct nonces, both open in order
+    first = encode_sealed_frame(FRAME_DATA, 1, 0, b"tensor", sender)
+    second = encode_sealed_frame(FRAME_DATA, 1, 0, b"tensor", sender)
+    assert first[1] != second[1]
+    assert decode_sealed_payload(*first, receiver) == b"tensor"
+    
+    # Tampered ciphertext, tampered header, replay: rejected
+    header, sealed = second
+    assert decode_sealed_payload(header, bytes([sealed[0] ^ 1]) + sealed[1:], receiver) is None
+    assert decode_sealed_payload(encode_header(FRAME_DATA, 2, 0, len(sealed)),
+                                 sealed, receiver) is None
+    assert decode_sealed_payload(*first, receiver) is None
+    assert decode_sealed_payload(header, sealed, receiver) == b"tensor"
+    
+    # Other direction's key: rejected
+    other = data_frame_cipher(api_key, token, initiator=False)
+    assert decode_sealed_payload(*encode_sealed_frame(FRAME_DATA, 1, 0, b"x", sender),
+                                 other) is None
+    print("✓ Sealed frames: round-trip, tamper and replay checks passed")
+
+
 # ============================================================================
 # Utility: Convert between UUID and bytes
 # ============================================================================
@@ -250,7 +498,7 @@ def size_comparison():
     # Binary approach
     bin_discovery = 50   # Compact binary
     bin_hello = 36       # UUID(16) + HMAC(16) + challenge(4)
-    bin_accept = 16      # token(8) + signature(8)
+    bin_accept = 32      # UUID(16) + token(8) + signature(8)
     bin_total = bin_discovery + bin_hello + bin_accept
     
     print(f"\nDiscovery Message:")
@@ -283,3 +531,7 @@ def size_comparison():
 
 if __name__ == "__main__":
     size_comparison()
+    try:
+        sealed_frame_check()
+    except ImportError:
+        print("Sealed frame check skipped (pip install asoc-protocol[tls])")
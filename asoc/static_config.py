@@ -26,12 +26,48 @@ Usage:
         api_key="secret",
         static_peers=os.environ.get("ASOC_PEERS", "").split(",")
     )
+
+Legacy: StaticNode was written against the prototype BinaryNode
+(node_binary) and its stream Connection (transport_fixed), neither of which
+ships in the package any more, so this module does not import. Use
+NodeReady(static_peers=[...]) - same arguments, with reconnect backoff.
 """
 
 import asyncio
+import enum
+import logging
+import math
+import random
+import socket
 from typing import Optional, List
-from node_binary import BinaryNode
-import uuid as uuid_module
+from .node_binary import BinaryNode  # legacy, not in the package (see above)
+from .node_ready import TCP_KEEPALIVE_OPTIONS, _set_nodelay, _set_tcp_options
+from .protocol_binary import (
+    FRAME_HELLO, FRAME_ACCEPT, FRAME_DATA, FRAME_END,
+    encode_hello, decode_accept
+)
+
+
+logger = logging.getLogger(__name__)
+
+# Reconnect backoff for static peers (seconds): full jitter, i.e. each
+# retry waits uniform(0, min(CAP, BASE * 2**attempt))
+RECONNECT_BACKOFF_BASE = 0.5
+RECONNECT_BACKOFF_CAP = 300.0
+
+# Static peer connect attempts in flight at once, and the random gap
+# (seconds, up to) between attempts started in the same pass
+MAX_CONCURRENT_CONNECTS = 16
+CONNECT_STAGGER = 0.05
+
+
+class ConnectResult(enum.Enum):
+    """Outcome of one static peer connect attempt"""
+    OK = "ok"                # connected, or already connected
+    REFUSED = "refused"      # nothing listening yet
+    TIMEOUT = "timeout"      # connect or ACCEPT timed out
+    AUTH_FAIL = "auth_fail"  # no/invalid ACCEPT
+    ERROR = "error"          # anything else
 
 
 class StaticNode(BinaryNode):
@@ -64,19 +100,45 @@ class StaticNode(BinaryNode):
         
         self.static_peers = static_peers or []
         self.enable_discovery = enable_discovery
+        self._node_prefix = self.node_id[:8]
         
         # Parse static peers
-        self._static_peer_list = []
-        for peer_str in self.static_peers:
-            if ':' in peer_str:
-                host, port_str = peer_str.rsplit(':', 1)
-                try:
-                    port = int(port_str)
-                    self._static_peer_list.append((host.strip(), port))
-                except ValueError:
-                    print(f"⚠️  Invalid peer format: {peer_str}")
-            else:
-                print(f"⚠️  Invalid peer format (expected host:port): {peer_str}")
+        parsed = [(peer_str, _parse_peer(peer_str)) for peer_str in self.static_peers]
+        self._static_peer_list = [addr for _, addr in parsed if addr]
+        for peer_str, addr in parsed:
+            if addr is None:
+                logger.warning("Invalid peer format (expected host:port): %s", peer_str)
+        
+        # self.peers key for each static peer, built once
+        self._peer_keys = {
+            (host, port): f"{host}:{port}".encode()
+            for host, port in self._static_peer_list
+        }
+        
+        # Per-peer reconnect state: (host, port) -> {attempt, next_try}
+        # (next_try is loop time)
+        self._reconnect = {
+            addr: {"attempt": 0, "next_try": 0.0}
+            for addr in self._static_peer_list
+        }
+        self._reconnect_wakeup = asyncio.Event()
+        
+        # Attempts in flight, and established connections by address
+        # ((host, port) -> key in self.peers); neither gets a new attempt
+        self._connecting = set()
+        self._peers_by_addr = {}
+        self._connect_sem = asyncio.Semaphore(MAX_CONCURRENT_CONNECTS)
+        
+        # Everything start() spawns (server, connector, connect attempts,
+        # recv loops) so shutdown() can cancel it; finished tasks drop out
+        self._bg_tasks = set()
+    
+    def _spawn(self, coro) -> asyncio.Task:
+        """create_task() that shutdown() knows about"""
+        task = asyncio.create_task(coro)
+        self._bg_tasks.add(task)
+        task.add_done_callback(self._bg_tasks.discard)
+        return task
     
     async def start(self):
         """Start node with static configuration"""
@@ -91,31 +153,100 @@ class StaticNode(BinaryNode):
         else:
             print(f"   Discovery: disabled (static only)")
         
-        asyncio.create_task(self._start_server())
-        asyncio.create_task(self._static_peer_connector())
+        self._spawn(self._start_server())
+        self._spawn(self._static_peer_connector())
+    
+    async def shutdown(self):
+        """Cancel background tasks, then shut the node down"""
+        tasks = list(self._bg_tasks)
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        self._bg_tasks.clear()
+        
+        # BinaryNode's own teardown (server, peer connections), if it has one
+        base_shutdown = getattr(super(), "shutdown", None)
+        if base_shutdown is not None:
+            await base_shutdown()
     
     async def _static_peer_connector(self):
         """Connect to static peers instead of using discovery"""
         
-        # Initial connection attempt
         print("\n📡 Connecting to static peers...")
-        for host, port in self._static_peer_list:
-            asyncio.create_task(self._connect_to_peer(host, port))
+        loop = asyncio.get_running_loop()
         
-        # Periodic reconnection for failed peers
         while True:
-            await asyncio.sleep(10)
-            
-            # Check which static peers are not connected
-            connected_peers = set(self.peers.keys())
+            # Cleared before the scan: attempts that finish during the
+            # stagger sleeps below set it again, and the wait picks that up
+            self._reconnect_wakeup.clear()
+            now = loop.time()
+            next_try = math.inf
+            started = 0
+            for addr, state in list(self._reconnect.items()):
+                if addr in self._connecting or addr in self._peers_by_addr:
+                    continue
+                if state["next_try"] > now:
+                    next_try = min(next_try, state["next_try"])
+                    continue
+                if started:
+                    # Spread SYNs/handshakes out instead of firing them at once
+                    await asyncio.sleep(random.uniform(0, CONNECT_STAGGER))
+                self._connecting.add(addr)
+                self._spawn(self._attempt_static_peer(addr, state))
+                started += 1
             
-            for host, port in self._static_peer_list:
-                # Try to connect if not already connected
-                # (We don't know the peer's UUID until we connect, so we just retry all)
-                asyncio.create_task(self._connect_to_peer(host, port))
+            # Sleep until the earliest retry is due, or the schedule changes
+            timeout = None if next_try == math.inf else max(0.0, next_try - loop.time())
+            try:
+                await asyncio.wait_for(self._reconnect_wakeup.wait(), timeout=timeout)
+            except asyncio.TimeoutError:
+                pass
+    
+    async def _attempt_static_peer(self, addr: tuple, state: dict):
+        """One connect attempt; schedules the next one on failure"""
+        host, port = addr
+        result = await self._connect_to_peer(host, port, self._peer_keys[addr])
+        if result is ConnectResult.OK:
+            state["attempt"] = 0
+            return
+        
+        logger.debug("[%s] connect to %s:%d failed (%s), attempt %d",
+                     self._node_prefix, host, port, result.value, state["attempt"] + 1)
+        
+        # Full jitter spreads a restarting cluster's retries over the window
+        window = min(RECONNECT_BACKOFF_CAP, RECONNECT_BACKOFF_BASE * 2 ** state["attempt"])
+        state["attempt"] += 1
+        state["next_try"] = asyncio.get_running_loop().time() + random.uniform(0, window)
+        self._reconnect_wakeup.set()
+    
+    async def _connect_to_peer(self, host: str, port: int,
+                               temp_key: Optional[bytes] = None) -> ConnectResult:
+        """
+        Connect to a specific peer by host:port
+        
+        Args:
+            temp_key: Precomputed self.peers key for this address
+        
+        Returns:
+            ConnectResult.OK if connected (or already connected), otherwise
+            the reason the attempt failed
+        """
+        if temp_key is None:
+            temp_key = f"{host}:{port}".encode()
+        
+        # Live connection already - skip the connect + handshake round trips
+        if temp_key in self.peers:
+            return ConnectResult.OK
+        
+        try:
+            async with self._connect_sem:
+                return await self._dial_static_peer(host, port, temp_key)
+        finally:
+            self._connecting.discard((host, port))
     
-    async def _connect_to_peer(self, host: str, port: int):
-        """Connect to a specific peer by host:port"""
+    async def _dial_static_peer(self, host: str, port: int,
+                                temp_key: bytes) -> ConnectResult:
+        """Open the connection and run the HELLO/ACCEPT exchange"""
         
         try:
             reader, writer = await asyncio.wait_for(
@@ -123,14 +254,10 @@ class StaticNode(BinaryNode):
                 timeout=5.0
             )
             
+            _tune_peer_socket(writer.get_extra_info('socket'))
             conn = Connection(reader, writer)
             
             # Send HELLO
-            from protocol_binary import (
-                FRAME_HELLO, FRAME_ACCEPT, 
-                encode_hello, decode_accept
-            )
-            
             hello_payload = encode_hello(self.node_id_bytes, self.api_key)
             await conn.send_frame(FRAME_HELLO, 0, 0, hello_payload)
             
@@ -142,55 +269,52 @@ class StaticNode(BinaryNode):
             
             if frame_type != FRAME_ACCEPT:
                 await conn.close()
-                return
+                return ConnectResult.AUTH_FAIL
             
             # Verify and extract session token
-            session_token = decode_accept(payload, self.api_key)
-            if not session_token:
+            accepted = decode_accept(payload, self.api_key)
+            if not accepted:
                 print(f"⚠️  Invalid ACCEPT from {host}:{port}")
                 await conn.close()
-                return
+                return ConnectResult.AUTH_FAIL
+            _, session_token = accepted
             
             # Get peer's ID from HELLO (we need to know it)
             # Actually, we get it from the connection, not HELLO response
             # Let's extract it properly...
             
             # For now, we'll discover the peer_id during recv
-            # Store connection temporarily
-            async with self._peers_lock:
-                # Check if we're already connected to this peer
-                # (can't check by ID yet, so check by address)
-                peer_addr = writer.get_extra_info('peername')
-                
-                # Store with temporary key, will update in recv_loop
-                temp_key = f"{host}:{port}".encode()
-                if temp_key not in self.peers:
-                    self.peers[temp_key] = conn
-                    
-                    async with self._tokens_lock:
-                        self._session_tokens[temp_key] = session_token
-                    
-                    print(f"✓ Connected to static peer: {host}:{port}")
-                    
-                    # Start recv loop (it will handle peer_id extraction)
-                    asyncio.create_task(self._static_recv_loop(conn, host, port))
+            # Store connection with temporary key, will update in recv_loop.
+            # No locks: nothing below awaits before the dict writes, so the
+            # single-threaded loop can't interleave another attempt here
+            if self.peers.setdefault(temp_key, conn) is not conn:
+                # Lost the race to a concurrent attempt - don't leak this socket
+                await conn.close()
+                return ConnectResult.OK
+            
+            self._peers_by_addr[(host, port)] = temp_key
+            self._session_tokens[temp_key] = session_token
+            
+            print(f"✓ Connected to static peer: {host}:{port}")
+            
+            # Start recv loop (it will handle peer_id extraction)
+            self._spawn(self._static_recv_loop(conn, host, port, temp_key))
+            return ConnectResult.OK
         
         except asyncio.TimeoutError:
             # Silent fail - will retry later
-            pass
+            return ConnectResult.TIMEOUT
         except ConnectionRefusedError:
             # Silent fail - peer not up yet
-            pass
+            return ConnectResult.REFUSED
         except Exception as e:
             # Log unexpected errors
             print(f"⚠️  Error connecting to {host}:{port}: {e}")
+            return ConnectResult.ERROR
     
-    async def _static_recv_loop(self, conn, host: str, port: int):
+    async def _static_recv_loop(self, conn, host: str, port: int, temp_key: bytes):
         """Receive loop for static peer connection"""
-        from protocol_binary import FRAME_DATA, FRAME_END, bytes_to_uuid
-        
         peer_id_bytes = None
-        temp_key = f"{host}:{port}".encode()
         
         try:
             while True:
@@ -201,26 +325,58 @@ class StaticNode(BinaryNode):
                 # For now, we'll track by connection
                 
                 if frame_type == FRAME_DATA:
-                    print(f"[{self.node_id[:8]}] recv stream {stream_id} "
-                          f"chunk {seq} size={len(payload)} "
-                          f"from {host}:{port}")
+                    logger.debug("[%s] recv stream %d chunk %d size=%d from %s:%d",
+                                 self._node_prefix, stream_id, seq, len(payload),
+                                 host, port)
                 
                 elif frame_type == FRAME_END:
-                    print(f"[{self.node_id[:8]}] stream {stream_id} complete")
+                    logger.debug("[%s] stream %d complete", self._node_prefix, stream_id)
         
         except asyncio.IncompleteReadError:
             print(f"Connection closed: {host}:{port}")
         except Exception as e:
             print(f"Recv error from {host}:{port}: {e}")
         finally:
-            async with self._peers_lock:
-                if temp_key in self.peers:
-                    del self.peers[temp_key]
+            if self.peers.get(temp_key) is conn:
+                del self.peers[temp_key]
+            self._peers_by_addr.pop((host, port), None)
             await conn.close()
+            
+            # Reconnect right away on the connector's next pass
+            state = self._reconnect.get((host, port))
+            if state is not None:
+                state["next_try"] = 0.0
+                self._reconnect_wakeup.set()
+
 
+# Import Connection for type hints (legacy, not in the package)
+from .transport_fixed import Connection
 
-# Import Connection for type hints
-from transport_fixed import Connection
+
+def _tune_peer_socket(sock):
+    """
+    No Nagle delay on HELLO/ACCEPT, and dead peers detected in seconds
+    (node_ready's keepalive/user-timeout options) so the reconnect backoff
+    kicks in; unsupported options are skipped
+    """
+    if sock is None or sock.family not in (socket.AF_INET, socket.AF_INET6):
+        return
+    _set_nodelay(sock)
+    try:
+        sock.setsockopt(socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1)
+    except OSError:
+        pass
+    _set_tcp_options(sock, TCP_KEEPALIVE_OPTIONS)
+
+
+def _parse_peer(peer_str: str):
+    """Parse "host:port" into (host, port), or None if malformed"""
+    host, _, port = peer_str.rpartition(':')
+    host = host.strip()
+    port = port.strip()
+    if host and port.isdigit():
+        return host, int(port)
+    return None
 
 
 def load_peers_from_file(filepath: str) -> List[str]:
@@ -233,17 +389,12 @@ def load_peers_from_file(filepath: str) -> List[str]:
         node3.example.com:9000
         # Comments are allowed
     """
-    peers = []
     try:
         with open(filepath, 'r') as f:
-            for line in f:
-                line = line.strip()
-                if line and not line.startswith('#'):
-                    peers.append(line)
+            return [line for line in map(str.strip, f) if line and line[0] != '#']
     except FileNotFoundError:
         print(f"⚠️  Peer file not found: {filepath}")
-    
-    return peers
+        return []
 
 
 def load_peers_from_env(env_var: str = "ASOC_PEERS", separator: str = ",") -> List[str]:
@@ -14,12 +14,35 @@ Usage:
 
 import ssl
 import os
+import functools
 import subprocess
 from pathlib import Path
 from typing import Optional, Tuple
 import tempfile
 
 
+def _read_pem(path: str) -> str:
+    """
+    Read PEM text once per (path, mtime)
+    
+    Feed the result to load_verify_locations(cadata=...) so OpenSSL parses
+    from memory instead of re-opening the file for every context.
+    """
+    return _read_pem_cached(path, os.stat(path).st_mtime_ns)
+
+
+@functools.lru_cache(maxsize=64)
+def _read_pem_cached(path: str, mtime_ns: int) -> str:
+    with open(path, "r", encoding="ascii") as f:
+        return f.read()
+
+
+@functools.lru_cache(maxsize=None)
+def _default_cert_dir() -> Path:
+    """~/.asoc/certs, resolving the home directory once per process"""
+    return Path.home() / ".asoc" / "certs"
+
+
 class TLSConfig:
     """
     Manages TLS configuration with smart defaults
@@ -30,8 +53,12 @@ class TLSConfig:
     3. Auto-generate temporary self-signed cert
     """
     
-    def __init__(self):
-        self.default_cert_dir = Path.home() / ".asoc" / "certs"
+    def __init__(self, base_dir: Optional[str] = None):
+        """
+        Args:
+            base_dir: Certificate directory (default: ~/.asoc/certs/)
+        """
+        self.default_cert_dir = Path(base_dir) if base_dir else _default_cert_dir()
         self.default_cert_file = self.default_cert_dir / "cert.pem"
         self.default_key_file = self.default_cert_dir / "key.pem"
     
@@ -52,17 +79,23 @@ class TLSConfig:
         """
         # Option 1: User provided both
         if cert_file and key_file:
-            if not Path(cert_file).exists():
-                raise FileNotFoundError(f"Certificate not found: {cert_file}")
-            if not Path(key_file).exists():
-                raise FileNotFoundError(f"Key not found: {key_file}")
+            for path, what in ((cert_file, "Certificate"), (key_file, "Key")):
+                try:
+                    os.stat(path)
+                except FileNotFoundError as e:
+                    raise FileNotFoundError(f"{what} not found: {path}") from e
             print(f"🔒 Using provided certificates:")
             print(f"   Cert: {cert_file}")
             print(f"   Key: {key_file}")
             return cert_file, key_file
         
         # Option 2: Check default location
-        if self.default_cert_file.exists() and self.default_key_file.exists():
+        try:
+            os.stat(self.default_cert_file)
+            os.stat(self.default_key_file)
+        except FileNotFoundError:
+            pass
+        else:
             print(f"🔒 Using existing certificates from {self.default_cert_dir}")
             return str(self.default_cert_file), str(self.default_key_file)
         
@@ -76,8 +109,14 @@ class TLSConfig:
         # Create directory
         self.default_cert_dir.mkdir(parents=True, exist_ok=True)
         
+        # Prefer Python's cryptography library: in-process, no fork/exec
         try:
-            # Try using OpenSSL (best option)
+            return self._generate_with_cryptography()
+        except ImportError:
+            pass
+        
+        try:
+            # Fallback: OpenSSL command-line tool
             cmd = [
                 "openssl", "req", "-x509", "-newkey", "rsa:2048",
                 "-keyout", str(self.default_key_file),
@@ -107,15 +146,9 @@ class TLSConfig:
         except (subprocess.TimeoutExpired, FileNotFoundError):
             pass
         
-        # Fallback: Use Python's cryptography library if available
-        try:
-            return self._generate_with_cryptography()
-        except ImportError:
-            pass
-        
         # Last resort: Create temporary cert (less secure, but works)
-        print("⚠️  OpenSSL not found. Using temporary certificate.")
-        print("   For production, install OpenSSL or provide your own certificates.")
+        print("⚠️  Neither cryptography nor OpenSSL available. Using temporary certificate.")
+        print("   For production, install cryptography or provide your own certificates.")
         return self._generate_temporary()
     
     def _generate_with_cryptography(self) -> Tuple[str, str]:
@@ -123,15 +156,19 @@ class TLSConfig:
         from cryptography import x509
         from cryptography.x509.oid import NameOID
         from cryptography.hazmat.primitives import hashes
-        from cryptography.hazmat.primitives.asymmetric import rsa
+        from cryptography.hazmat.primitives.asymmetric import ec, rsa
         from cryptography.hazmat.primitives import serialization
         import datetime
         
-        # Generate private key
-        private_key = rsa.generate_private_key(
-            public_exponent=65537,
-            key_size=2048,
-        )
+        # Generate private key: ECDSA P-256 (~1 ms keygen, small certs);
+        # ASOC_TLS_KEY_TYPE=rsa for peers that only speak RSA
+        if os.environ.get("ASOC_TLS_KEY_TYPE", "").lower() == "rsa":
+            private_key = rsa.generate_private_key(
+                public_exponent=65537,
+                key_size=2048,
+            )
+        else:
+            private_key = ec.generate_private_key(ec.SECP256R1())
         
         # Generate certificate
         subject = issuer = x509.Name([
@@ -212,12 +249,19 @@ class TLSConfig:
         Returns:
             Configured SSLContext
         """
-        if is_server:
-            purpose = ssl.Purpose.CLIENT_AUTH
+        if verify_mode == "none":
+            # Nothing is verified, so skip create_default_context() loading
+            # the system CA bundle only to ignore it
+            context = ssl.SSLContext(
+                ssl.PROTOCOL_TLS_SERVER if is_server else ssl.PROTOCOL_TLS_CLIENT
+            )
         else:
-            purpose = ssl.Purpose.SERVER_AUTH
+            if is_server:
+                purpose = ssl.Purpose.CLIENT_AUTH
+            else:
+                purpose = ssl.Purpose.SERVER_AUTH
+            context = ssl.create_default_context(purpose)
         
-        context = ssl.create_default_context(purpose)
         context.load_cert_chain(cert_file, key_file)
         
         # Set verification mode
@@ -232,8 +276,12 @@ class TLSConfig:
         else:
             raise ValueError(f"Invalid verify_mode: {verify_mode}")
         
-        # Use modern TLS only
+        # Use modern TLS only, with AEAD suites (AES-GCM / ChaCha20-Poly1305)
+        # for TLS 1.2 - TLS 1.3 suites are AEAD-only already. Session
+        # tickets stay on: reconnecting nodes resume with them
         context.minimum_version = ssl.TLSVersion.TLSv1_2
+        context.set_ciphers("ECDHE+AESGCM:ECDHE+CHACHA20")
+        context.options |= ssl.OP_NO_COMPRESSION
         
         return context
 
@@ -286,8 +334,24 @@ def setup_tls(
     else:
         verify_mode = "none"
     
-    # Create SSL context
-    ssl_context = config.create_ssl_context(
+    # Create SSL context (shared by every node with the same settings;
+    # rebuilt when a certificate, key or CA file changes)
+    return _cached_ssl_context(
+        cert_path,
+        key_path,
+        is_server,
+        verify_mode,
+        _read_pem(ca_file) if ca_file else None,
+        os.stat(cert_path).st_mtime_ns,
+        os.stat(key_path).st_mtime_ns
+    )
+
+
+@functools.lru_cache(maxsize=32)
+def _cached_ssl_context(cert_path, key_path, is_server, verify_mode, cadata,
+                        cert_mtime, key_mtime) -> ssl.SSLContext:
+    """Build a setup_tls() context (cached on its inputs and file mtimes)"""
+    ssl_context = TLSConfig().create_ssl_context(
         cert_path,
         key_path,
         is_server=is_server,
@@ -295,8 +359,8 @@ def setup_tls(
     )
     
     # Load CA if provided
-    if ca_file:
-        ssl_context.load_verify_locations(ca_file)
+    if cadata:
+        ssl_context.load_verify_locations(cadata=cadata)
     
     return ssl_context
 
@@ -309,12 +373,7 @@ def generate_certificates(output_dir: Optional[str] = None):
     Args:
         output_dir: Where to save certificates (default: ~/.asoc/certs/)
     """
-    config = TLSConfig()
-    
-    if output_dir:
-        config.default_cert_dir = Path(output_dir)
-        config.default_cert_file = config.default_cert_dir / "cert.pem"
-        config.default_key_file = config.default_cert_dir / "key.pem"
+    config = TLSConfig(base_dir=output_dir)
     
     cert, key = config._generate_self_signed()
     
@@ -4,61 +4,167 @@ Working ASoc Benchmark
 Tests throughput and latency with the production-ready node
 """
 
+import array
 import asyncio
+import contextlib
+import functools
+import gc
+import logging
+import os
 import time
 import statistics
 import sys
+import tempfile
+import threading
 
-# Import numpy if available, otherwise use random
+# Import numpy if available, otherwise use os.urandom (one syscall, no
+# per-byte Python loop)
 try:
     import numpy as np
-    def generate_data(size_bytes):
-        return np.random.bytes(size_bytes)
+    _rng = np.random.default_rng()
+    _random_bytes = _rng.bytes
 except ImportError:
-    import random
-    def generate_data(size_bytes):
-        return bytes(random.getrandbits(8) for _ in range(size_bytes))
+    np = None
+    _random_bytes = os.urandom
 
-from asoc import NodeReady
 
+@functools.lru_cache(maxsize=8)
+def generate_data(size_bytes):
+    """Random payload of size_bytes; cached per size (bytes are immutable)"""
+    return _random_bytes(size_bytes)
 
-async def benchmark_throughput():
-    """Benchmark raw throughput"""
-    
-    print("=" * 70)
-    print("ASoc Throughput Benchmark")
-    print("=" * 70)
-    
-    # Create nodes
+from asoc import NodeReady, use_uvloop
+from asoc.protocol_binary import HEADER_SIZE
+
+# Frame payload size used for throughput runs; every test size is a whole
+# number of chunks, so header overhead is the same for all of them
+CHUNK_SIZE = 1 << 20
+HEADER_OVERHEAD_PCT = HEADER_SIZE / CHUNK_SIZE * 100
+
+
+class ThreadedNode:
+    """
+    Runs a node on its own event loop in a background thread
+    
+    Keeps the receiver's accept/recv work off the sender's selector, so the
+    two sides don't contend for one loop. Proxies the few node methods the
+    benchmarks use; the loop comes from the current policy (uvloop if
+    use_uvloop() installed it).
+    """
+    
+    def __init__(self, node):
+        self.node = node
+        self.node_id = node.node_id
+        self.loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(target=self.loop.run_forever, daemon=True)
+        self._thread.start()
+    
+    def call(self, coro):
+        """Run coro on the node's loop; awaitable from the caller's loop"""
+        return asyncio.wrap_future(asyncio.run_coroutine_threadsafe(coro, self.loop))
+    
+    def get_peer_ids(self):
+        # Copy-on-write peer table: safe to read from another thread
+        return self.node.get_peer_ids()
+    
+    async def start(self):
+        await self.call(self.node.start())
+    
+    async def wait_stream_complete(self, peer_id, stream_id):
+        await self.call(self.node.wait_stream_complete(peer_id, stream_id))
+    
+    async def shutdown(self):
+        await self.call(self.node.shutdown())
+        await self.call(_cancel_other_tasks())
+        self.loop.call_soon_threadsafe(self.loop.stop)
+        await asyncio.to_thread(self._thread.join)
+        self.loop.close()
+
+
+async def _cancel_other_tasks():
+    """Cancel every task on the running loop except this one"""
+    tasks = asyncio.all_tasks() - {asyncio.current_task()}
+    for task in tasks:
+        task.cancel()
+    await asyncio.gather(*tasks, return_exceptions=True)
+
+
+@contextlib.asynccontextmanager
+async def setup_pair(community, ports):
+    """Start a sender/receiver pair on ports, shut both down on exit"""
     sender = NodeReady(
-        community="bench",
+        community=community,
         api_key="benchmark-key",
-        port=9001
+        port=ports[0]
     )
     
-    receiver = NodeReady(
-        community="bench",
+    receiver = ThreadedNode(NodeReady(
+        community=community,
         api_key="benchmark-key",
-        port=9002
-    )
+        port=ports[1]
+    ))
     
     print("\n📡 Starting nodes...")
     await sender.start()
     await receiver.start()
-    
-    print("⏳ Waiting for connection...")
-    await asyncio.sleep(4)
-    
-    peers = sender.get_peer_ids()
-    if not peers:
-        print("❌ ERROR: Nodes failed to connect!")
-        print("   Check firewall or try static configuration")
+    try:
+        yield sender, receiver
+    finally:
         await sender.shutdown()
         await receiver.shutdown()
-        return
+
+
+async def wait_for_peer(node, peer, timeout=4.0):
+    """Return peer's ID as soon as node has a connection to it"""
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        # Either side may have dialed: node sees peer inbound, or peer
+        # accepted node's connection (node then sends on that one)
+        if peer.node_id in node.get_peer_ids() or node.node_id in peer.get_peer_ids():
+            return peer.node_id
+        await asyncio.sleep(0.05)
+    raise TimeoutError("no peer connected")
+
+
+@contextlib.contextmanager
+def gc_paused():
+    """Collect now, then keep the cyclic GC out of the timed region"""
+    gc.collect()
+    was_enabled = gc.isenabled()
+    gc.disable()
+    try:
+        yield
+    finally:
+        if was_enabled:
+            gc.enable()
+
+
+async def warmup(sender, receiver, peer_id, rounds=5):
+    """
+    Run every send path a few times at small sizes before any timing, so
+    first-use costs (imports, allocator growth, cold caches) stay out of
+    the results
+    """
+    small = generate_data(4096)
+    with tempfile.TemporaryFile() as f:
+        f.write(small)
+        f.flush()
+        for _ in range(rounds):
+            for send in (
+                lambda: sender.stream_tensor(peer_id, small[:1024]),            # one chunk
+                lambda: sender.stream_tensor(peer_id, small, chunk_size=1024),  # batched
+                lambda: sender.stream_tensor_from_fd(peer_id, f, len(small)),   # sendfile
+            ):
+                stream_id = await send()
+                await asyncio.wait_for(receiver.wait_stream_complete(sender.node_id, stream_id), timeout=30)
+
+
+async def benchmark_throughput(sender, receiver, peer_id):
+    """Benchmark raw throughput"""
     
-    peer_id = peers[0]
-    print(f"✅ Connected to {peer_id[:8]}\n")
+    print("\n" + "=" * 70)
+    print("ASoc Throughput Benchmark")
+    print("=" * 70 + "\n")
     
     # Test different sizes
     sizes_mb = [1, 10, 50, 100]
@@ -71,27 +177,17 @@ async def benchmark_throughput():
         size_bytes = size_mb * 1024 * 1024
         data = generate_data(size_bytes)
         
-        # Warm up
-        if size_mb == sizes_mb[0]:
-            await sender.stream_tensor(peer_id, data[:1024*1024])
-            await asyncio.sleep(0.5)
-        
         # Benchmark
-        start = time.perf_counter()
-        await sender.stream_tensor(peer_id, data)
-        
-        # Small delay to let receiver finish processing
-        await asyncio.sleep(0.2)
-        
-        elapsed = time.perf_counter() - start
+        with gc_paused():
+            start = time.perf_counter()
+            stream_id = await sender.stream_tensor(peer_id, data, chunk_size=CHUNK_SIZE)
+            
+            # Stop the clock when the receiver has seen FRAME_END
+            await asyncio.wait_for(receiver.wait_stream_complete(sender.node_id, stream_id), timeout=30)
+            
+            elapsed = time.perf_counter() - start
         throughput_mbps = size_mb / elapsed
         
-        # Calculate overhead
-        header_bytes = 14  # Per frame
-        num_frames = (size_bytes + 1024*1024 - 1) // (1024*1024)  # Ceiling division
-        total_overhead = header_bytes * num_frames
-        overhead_pct = (total_overhead / size_bytes) * 100
-        
         results.append({
             'size_mb': size_mb,
             'time': elapsed,
@@ -99,7 +195,23 @@ async def benchmark_throughput():
         })
         
         print(f"{size_mb:3d} MB    {elapsed:6.2f}s    "
-              f"{throughput_mbps:8.1f} MB/s    {overhead_pct:.3f}%")
+              f"{throughput_mbps:8.1f} MB/s    {HEADER_OVERHEAD_PCT:.3f}%")
+        
+        # Same payload from a file: sendfile() skips the user-space copy
+        with tempfile.TemporaryFile() as f:
+            f.write(data)
+            f.flush()
+            
+            with gc_paused():
+                start = time.perf_counter()
+                stream_id = await sender.stream_tensor_from_fd(
+                    peer_id, f, size_bytes, chunk_size=CHUNK_SIZE
+                )
+                await asyncio.wait_for(receiver.wait_stream_complete(sender.node_id, stream_id), timeout=30)
+                elapsed = time.perf_counter() - start
+        
+        print(f"{size_mb:3d} MB    {elapsed:6.2f}s    "
+              f"{size_mb / elapsed:8.1f} MB/s    (sendfile)")
     
     # Summary
     print("\n" + "=" * 70)
@@ -107,45 +219,17 @@ async def benchmark_throughput():
     throughputs = [r['throughput'] for r in results]
     print(f"  Average throughput: {statistics.mean(throughputs):.1f} MB/s")
     print(f"  Peak throughput: {max(throughputs):.1f} MB/s")
-    print(f"  Protocol overhead: < 0.002% (14 bytes per 1MB frame)")
+    print(f"  Protocol overhead: {HEADER_OVERHEAD_PCT:.4f}% "
+          f"({HEADER_SIZE} bytes per {CHUNK_SIZE >> 20}MB frame)")
     print("=" * 70)
-    
-    await sender.shutdown()
-    await receiver.shutdown()
 
 
-async def benchmark_latency():
+async def benchmark_latency(sender, receiver, peer_id):
     """Benchmark latency for small messages"""
     
     print("\n" + "=" * 70)
     print("ASoc Latency Benchmark (Small Messages)")
-    print("=" * 70)
-    
-    sender = NodeReady(
-        community="latency-bench",
-        api_key="bench-key",
-        port=9003
-    )
-    
-    receiver = NodeReady(
-        community="latency-bench",
-        api_key="bench-key",
-        port=9004
-    )
-    
-    await sender.start()
-    await receiver.start()
-    await asyncio.sleep(4)
-    
-    peers = sender.get_peer_ids()
-    if not peers:
-        print("❌ Nodes failed to connect")
-        await sender.shutdown()
-        await receiver.shutdown()
-        return
-    
-    peer_id = peers[0]
-    print(f"✅ Connected\n")
+    print("=" * 70 + "\n")
     
     # Test different message sizes
     sizes = [
@@ -167,61 +251,45 @@ async def benchmark_latency():
             size_bytes = size_val * 1024 * 1024
         
         data = generate_data(size_bytes)
-        latencies = []
         
-        for _ in range(iterations):
-            start = time.perf_counter()
-            await sender.stream_tensor(peer_id, data)
-            elapsed = time.perf_counter() - start
-            latencies.append(elapsed * 1000)  # Convert to ms
-            
-            await asyncio.sleep(0.01)  # Brief pause
+        # Bind hot names once so the timed region is just the send
+        stream = sender.stream_tensor
+        clock = time.perf_counter
+        lats = array.array('d', [0.0] * iterations)
         
-        mean_lat = statistics.mean(latencies)
-        median_lat = statistics.median(latencies)
-        p99_lat = sorted(latencies)[int(0.99 * len(latencies))]
+        with gc_paused():
+            for i in range(iterations):
+                t0 = clock()
+                await stream(peer_id, data)
+                lats[i] = (clock() - t0) * 1000  # Convert to ms
+                
+                await asyncio.sleep(0)  # Yield to the receiver
+        
+        k = int(0.99 * iterations)
+        if np is not None:
+            # Mean/median in C, P99 by O(n) selection instead of a sort
+            a = np.asarray(lats)
+            mean_lat = a.mean()
+            median_lat = np.median(a)
+            p99_lat = np.partition(a, k)[k]
+        else:
+            latencies = lats.tolist()
+            mean_lat = statistics.mean(latencies)
+            median_lat = statistics.median(latencies)
+            p99_lat = sorted(latencies)[k]
         
         print(f"{size_val:3d} {size_unit:<8} {iterations:<12} "
               f"{mean_lat:8.2f}ms   {median_lat:8.2f}ms   {p99_lat:8.2f}ms")
     
     print("=" * 70)
-    
-    await sender.shutdown()
-    await receiver.shutdown()
 
 
-async def benchmark_concurrent():
+async def benchmark_concurrent(sender, receiver, peer_id):
     """Benchmark concurrent streams"""
     
     print("\n" + "=" * 70)
     print("ASoc Concurrent Streams Benchmark")
-    print("=" * 70)
-    
-    sender = NodeReady(
-        community="concurrent-bench",
-        api_key="bench-key",
-        port=9005
-    )
-    
-    receiver = NodeReady(
-        community="concurrent-bench",
-        api_key="bench-key",
-        port=9006
-    )
-    
-    await sender.start()
-    await receiver.start()
-    await asyncio.sleep(4)
-    
-    peers = sender.get_peer_ids()
-    if not peers:
-        print("❌ Nodes failed to connect")
-        await sender.shutdown()
-        await receiver.shutdown()
-        return
-    
-    peer_id = peers[0]
-    print(f"✅ Connected\n")
+    print("=" * 70 + "\n")
     
     # Test with different numbers of concurrent streams
     stream_counts = [1, 5, 10, 20]
@@ -230,20 +298,27 @@ async def benchmark_concurrent():
     print(f"{'Streams':<12} {'Total Data':<15} {'Time':<12} {'Throughput':<15}")
     print("-" * 70)
     
+    # One buffer shared by every stream; stream_tensor slices the view
+    # into frames without copying
+    data = memoryview(generate_data(tensor_size_mb * 1024 * 1024))
+    
     for num_streams in stream_counts:
-        data = generate_data(tensor_size_mb * 1024 * 1024)
-        
-        start = time.perf_counter()
-        
-        # Send multiple streams concurrently
-        tasks = [
-            sender.stream_tensor(peer_id, data)
-            for _ in range(num_streams)
-        ]
-        
-        await asyncio.gather(*tasks)
-        
-        elapsed = time.perf_counter() - start
+        with gc_paused():
+            start = time.perf_counter()
+            
+            # Send multiple streams concurrently
+            if hasattr(asyncio, "TaskGroup"):
+                async with asyncio.TaskGroup() as tg:
+                    for _ in range(num_streams):
+                        tg.create_task(sender.stream_tensor(peer_id, data))
+            else:
+                # Python < 3.11: schedule each send as it's built, then wait
+                await asyncio.gather(*[
+                    asyncio.ensure_future(sender.stream_tensor(peer_id, data))
+                    for _ in range(num_streams)
+                ])
+            
+            elapsed = time.perf_counter() - start
         total_mb = tensor_size_mb * num_streams
         throughput = total_mb / elapsed
         
@@ -251,9 +326,6 @@ async def benchmark_concurrent():
               f"{elapsed:8.2f}s   {throughput:8.1f} MB/s")
     
     print("=" * 70)
-    
-    await sender.shutdown()
-    await receiver.shutdown()
 
 
 async def main():
@@ -271,13 +343,24 @@ async def main():
     """)
     
     try:
-        await benchmark_throughput()
-        await asyncio.sleep(2)
-        
-        await benchmark_latency()
-        await asyncio.sleep(2)
-        
-        await benchmark_concurrent()
+        # One pair for the whole suite: no per-benchmark startup/discovery
+        async with setup_pair("bench", (9001, 9002)) as (sender, receiver):
+            print("⏳ Waiting for connection...")
+            try:
+                peer_id = await wait_for_peer(sender, receiver)
+            except TimeoutError:
+                print("❌ ERROR: Nodes failed to connect!")
+                print("   Check firewall or try static configuration")
+                return
+            
+            print(f"✅ Connected to {peer_id[:8]}")
+            
+            print("🔥 Warming up...")
+            await warmup(sender, receiver, peer_id)
+            
+            await benchmark_throughput(sender, receiver, peer_id)
+            await benchmark_latency(sender, receiver, peer_id)
+            await benchmark_concurrent(sender, receiver, peer_id)
         
     except KeyboardInterrupt:
         print("\n\n⚠️  Benchmark interrupted")
@@ -295,4 +378,10 @@ if __name__ == "__main__":
         print("❌ Python 3.7+ required")
         sys.exit(1)
     
+    # Per-frame/per-stream node logging stays off the timed paths
+    logging.basicConfig(level=logging.WARNING)
+    
+    if use_uvloop():
+        print("⚡ Using uvloop event loop")
+    
     asyncio.run(main())
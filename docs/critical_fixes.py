@@ -27,9 +27,25 @@ async def _start_server(self):
     
     self._server = server  # Store reference for shutdown
     
+    # Accepted sockets inherit these from the listener: no Nagle delay on
+    # frame tails, and kernel buffers large enough for 1 MB frames
+    # (Linux caps them at net.core.wmem_max / rmem_max - raise those too)
+    for sock in server.sockets:
+        sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        sock.setsockopt(socket.SOL_SOCKET, socket.SO_SNDBUF, 16 << 20)
+        sock.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, 16 << 20)
+    
     async with server:
         await server.serve_forever()
 
+# And the same three options at the top of _handle_client (dialed
+# connections get them the same way after open_connection()):
+#     sock = writer.get_extra_info('socket')
+#     if sock is not None:
+#         sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+#         sock.setsockopt(socket.SOL_SOCKET, socket.SO_SNDBUF, 16 << 20)
+#         sock.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, 16 << 20)
+
 
 # ============================================================================
 # FIX 3: Proper graceful shutdown
@@ -57,7 +73,11 @@ async def shutdown(self):
 # ============================================================================
 # FIX 4: Add timeout to drain() to prevent deadlock
 # ============================================================================
-# In transport_fixed.py:
+# In transport_fixed.py, Connection.__init__ - raise the write watermarks
+# (default high is 64 KB) so 1 MB frames don't block drain() on every send;
+# the timeout below is then only a dead-peer safety net:
+#     writer.transport.set_write_buffer_limits(high=4 << 20, low=1 << 20)
+
 async def send_frame(self, frame_type, stream_id, seq, payload=b""):
     """Send frame with flow control and timeout"""
     async with self._send_semaphore:
@@ -74,17 +94,14 @@ async def send_frame(self, frame_type, stream_id, seq, payload=b""):
 # ============================================================================
 # FIX 5: Auto-incrementing stream IDs to prevent collisions
 # ============================================================================
-# In node_binary.py, add to __init__:
-self._next_stream_id = 1
-self._stream_id_lock = asyncio.Lock()
+# In node_binary.py, add to __init__ (no lock needed: next() never yields
+# to the event loop, so two coroutines can't get the same ID):
+self._stream_ids = itertools.count(1, 2)  # Odd numbers only (even for peer-initiated)
 
 # Add helper method:
-async def _get_next_stream_id(self) -> int:
+def _get_next_stream_id(self) -> int:
     """Get next available stream ID"""
-    async with self._stream_id_lock:
-        stream_id = self._next_stream_id
-        self._next_stream_id += 2  # Odd numbers only (even for peer-initiated)
-        return stream_id
+    return next(self._stream_ids)
 
 # Modify stream_tensor:
 async def stream_tensor(self, 
@@ -96,7 +113,7 @@ async def stream_tensor(self,
     
     # Auto-assign stream ID if not provided
     if tensor_id is None:
-        tensor_id = await self._get_next_stream_id()
+        tensor_id = self._get_next_stream_id()
     
     # ... rest of function
 
@@ -121,26 +138,35 @@ async def _cleanup_loop(self):
             for node_id in stale:
                 del self.peers[node_id]
         
-        # Remove old challenges (keep last 1000, remove older than 60s)
-        async with self._challenges_lock:
-            if len(self._seen_challenges) > 1000:
-                # Convert to list with timestamps, remove old
-                # For now, just limit size more conservatively
-                if len(self._seen_challenges) > 5000:
-                    # Remove oldest half
-                    challenges_list = list(self._seen_challenges)
-                    self._seen_challenges = set(challenges_list[len(challenges_list)//2:])
+        # Remove challenges older than 60s: oldest first from the deque,
+        # so the cost is the number expired, not the number stored
+        while self._challenge_deque and now - self._challenge_deque[0][1] > 60:
+            challenge, _ = self._challenge_deque.popleft()
+            self._challenge_set.discard(challenge)
+
+# In __init__, replace self._seen_challenges / self._challenges_lock with:
+self._challenge_deque = collections.deque()  # (challenge, ts), oldest first
+self._challenge_set = set()                  # O(1) membership
+
+# And where an announcement is received:
+if challenge in self._challenge_set:
+    return  # replay
+self._challenge_set.add(challenge)
+self._challenge_deque.append((challenge, time.time()))
 
 
 # ============================================================================
 # FIX 7: Add data consumer for benchmarking
 # ============================================================================
-# In node_binary.py, add option to collect received data:
+# In node_binary.py, add option to collect received data
+# (with log = logging.getLogger(__name__) at module level):
 def __init__(self, ..., collect_received=False):
     # ... existing init
     self.collect_received = collect_received
-    self._received_data = {}  # stream_id -> list of chunks
-    self._received_lock = asyncio.Lock()
+    # stream_id -> bytearray of the payload so far. No lock: each
+    # connection has one recv task and frames arrive in seq order, so
+    # appending is the same as writing at seq * chunk_size
+    self._received_data = {}
 
 async def _recv_loop(self, conn: Connection, peer_id_bytes: bytes):
     """Receive loop"""
@@ -152,16 +178,17 @@ async def _recv_loop(self, conn: Connection, peer_id_bytes: bytes):
             
             if frame_type == FRAME_DATA:
                 if self.collect_received:
-                    async with self._received_lock:
-                        if stream_id not in self._received_data:
-                            self._received_data[stream_id] = []
-                        self._received_data[stream_id].append((seq, payload))
+                    buf = self._received_data.get(stream_id)
+                    if buf is None:
+                        buf = self._received_data[stream_id] = bytearray()
+                    buf += payload  # one memcpy, no per-chunk objects
                 
-                print(f"[{self.node_id[:8]}] recv stream {stream_id} "
-                      f"chunk {seq} size={len(payload)}")
+                # Lazy %-formatting: nothing is built unless DEBUG is on
+                log.debug("[%s] recv stream %d chunk %d size=%d",
+                          self.node_id[:8], stream_id, seq, len(payload))
             
             elif frame_type == FRAME_END:
-                print(f"[{self.node_id[:8]}] stream {stream_id} complete")
+                log.debug("[%s] stream %d complete", self.node_id[:8], stream_id)
                 
     except Exception as e:
         print(f"Recv error: {e}")
@@ -172,50 +199,77 @@ async def _recv_loop(self, conn: Connection, peer_id_bytes: bytes):
 # ============================================================================
 # FIX 8: Add timeouts to recv_frame
 # ============================================================================
-# In transport_fixed.py:
+# In transport_fixed.py (self._rbuf = bytearray() in __init__). One read()
+# usually brings in a whole small frame, so header + payload cost one
+# await instead of two; bytes past this frame stay in _rbuf for the next
+# call. (asoc/node_ready.py goes further: a BufferedProtocol parses every
+# frame in each socket read without any per-frame await.)
 async def recv_frame(self):
     """Receive frame with timeout"""
+    buf = self._rbuf
     try:
-        header = await asyncio.wait_for(
-            self.reader.readexactly(HEADER_SIZE),
-            timeout=30.0
-        )
-        version, frame_type, stream_id, seq, length = decode_header(header)
+        while len(buf) < HEADER_SIZE:
+            await self._fill(buf)
+        version, frame_type, stream_id, seq, length = decode_header_from(buf)
         
-        payload = await asyncio.wait_for(
-            self.reader.readexactly(length),
-            timeout=30.0
-        )
+        end = HEADER_SIZE + length
+        while len(buf) < end:
+            await self._fill(buf)
         
+        payload = bytes(buf[HEADER_SIZE:end])
+        del buf[:end]
         return frame_type, stream_id, seq, payload
     except asyncio.TimeoutError:
         raise ConnectionError("Receive timeout")
 
+async def _fill(self, buf):
+    """Append whatever the socket has (up to 64 KB) to buf"""
+    data = await asyncio.wait_for(self.reader.read(HEADER_SIZE + 65536), timeout=30.0)
+    if not data:
+        raise asyncio.IncompleteReadError(bytes(buf), None)
+    buf += data
+
 
 # ============================================================================
 # FIX 9: Consistent UUID handling
 # ============================================================================
 # Add helper class to node_binary.py:
 class PeerID:
-    """Wrapper to handle UUID string/bytes consistently"""
+    """
+    Wrapper to handle UUID string/bytes consistently
+    
+    Holds only the raw 16 bytes (the form used on the wire and as dict
+    keys); the string form is built on demand, so the per-frame path never
+    creates a uuid.UUID.
+    """
+    
+    __slots__ = ('_b',)
     
     def __init__(self, value):
-        if isinstance(value, str):
-            self.uuid = uuid_module.UUID(value)
-        elif isinstance(value, bytes):
-            self.uuid = uuid_module.UUID(bytes=value)
+        if isinstance(value, (bytes, bytearray)):
+            if len(value) != 16:
+                raise ValueError(f"Invalid peer ID length: {len(value)}")
+            self._b = bytes(value)
+        elif isinstance(value, str):
+            self._b = uuid_module.UUID(value).bytes
         elif isinstance(value, uuid_module.UUID):
-            self.uuid = value
+            self._b = value.bytes
         else:
             raise ValueError(f"Invalid peer ID type: {type(value)}")
     
     @property
     def bytes(self) -> bytes:
-        return self.uuid.bytes
+        return self._b
     
     @property
     def string(self) -> str:
-        return str(self.uuid)
+        return str(uuid_module.UUID(bytes=self._b))
+    
+    def __hash__(self):
+        return hash(self._b)
+    
+    def __eq__(self, other):
+        return isinstance(other, PeerID) and self._b == other._b
     
     def __str__(self):
         return self.string
@@ -46,6 +46,12 @@ setup(
         "benchmark": [
             "numpy>=1.20",
         ],
+        "tls": [
+            "cryptography>=3.1",
+        ],
+        "uvloop": [
+            "uvloop>=0.17; sys_platform != 'win32'",
+        ],
     },
     entry_points={
         "console_scripts": [
@@ -11,17 +11,284 @@ Usage:
 
 import asyncio
 import argparse
+import gc
+import math
+import mmap
 import os
 import sys
 import time
 import socket
-import numpy as np
+import struct
+import tempfile
+import uuid
 from pathlib import Path
 
 # Add parent directory to path if running from slurm subdirectory
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
-from asoc import NodeReady
+from asoc import NodeReady, use_uvloop
+
+
+# Broadcast stream IDs: even (auto-assigned IDs are odd), one block per
+# iteration - the tensor keeps its ID on every hop of the tree, and each
+# rank acks the root with tensor_id + 2 * rank
+ITERATION_STREAM_BASE = 1 << 16
+
+# Barrier stream IDs: well above any iteration block, one block per barrier,
+# and each rank signals with barrier base + 2 * rank
+BARRIER_STREAM_BASE = 1 << 30
+
+# --transport ucx: each rank's UCX listener is on its ASoc port + this
+UCX_PORT_OFFSET = 1000
+
+# Rank 0 stamps its wall clock (time.time_ns()) into the first 8 bytes of
+# each tensor, so every rank can time the broadcast's arrival one way
+SEND_STAMP = struct.Struct("!q")
+
+
+def tail(sorted_values, q):
+    """q-quantile of already sorted values (nearest rank)"""
+    return sorted_values[max(0, math.ceil(q * len(sorted_values)) - 1)]
+
+
+def rank_node_id(community, rank):
+    """Deterministic node ID per rank, so every rank can address every other"""
+    return str(uuid.uuid5(uuid.NAMESPACE_URL, f"asoc://{community}/rank/{rank}"))
+
+
+def binomial_tree(rank, world_size, root=0):
+    """
+    MPI-style binomial broadcast schedule for rank
+    
+    Returns:
+        (parent rank or None for the root, child ranks in send order)
+    """
+    vrank = (rank - root) % world_size
+    parent = None
+    mask = 1
+    while mask < world_size:
+        if vrank & mask:
+            parent = (vrank - mask + root) % world_size
+            break
+        mask <<= 1
+    
+    # Children: every lower bit we could still set, largest subtree first
+    children = []
+    mask >>= 1
+    while mask > 0:
+        if vrank + mask < world_size:
+            children.append((vrank + mask + root) % world_size)
+        mask >>= 1
+    return parent, children
+
+
+def locality_tree(rank, hosts):
+    """
+    Two-level broadcast schedule from rank 0: a binomial tree across hosts
+    (each host's lowest rank is its leader), then one within each host
+    
+    The tensor crosses the network once per host; co-located ranks get it
+    from their leader over loopback.
+    
+    Args:
+        hosts: host of every rank, indexed by rank
+    
+    Returns:
+        (parent rank or None for rank 0, child ranks in send order)
+    """
+    leaders = {}  # host -> leader rank
+    for r, host in enumerate(hosts):
+        leaders.setdefault(host, r)
+    leader_ranks = list(leaders.values())  # ascending, rank 0 first
+    
+    parent = None
+    children = []
+    host = hosts[rank]
+    if leaders[host] == rank:
+        i = leader_ranks.index(rank)
+        p, kids = binomial_tree(i, len(leader_ranks))
+        parent = None if p is None else leader_ranks[p]
+        children = [leader_ranks[k] for k in kids]  # remote subtrees first
+    
+    local = [r for r, h in enumerate(hosts) if h == host]
+    p, kids = binomial_tree(local.index(rank), len(local))
+    if p is not None:
+        parent = local[p]
+    children += [local[k] for k in kids]
+    return parent, children
+
+
+def rank_hosts(static_peers):
+    """Host of each ASOC_PEERS entry, resolved so aliases of one machine match"""
+    hosts = []
+    for peer in static_peers:
+        host = peer.rsplit(":", 1)[0]
+        try:
+            host = socket.gethostbyname(host)
+        except OSError:
+            pass
+        hosts.append(host)
+    return hosts
+
+
+async def broadcast_tensor(node, rank_ids, children, tensor_id, data):
+    """Send data to this rank's tree children (same tensor_id on every hop)"""
+    await node.broadcast_tensor([rank_ids[child] for child in children], data,
+                                tensor_id=tensor_id)
+
+
+async def broadcast_file(node, rank_ids, children, tensor_id, fobj, length):
+    """broadcast_tensor() from a file: os.sendfile() from the page cache"""
+    # One sendfile() stream per child, each on its own connection. They
+    # share fobj safely: send_file() passes every chunk's offset explicitly
+    # (sendfile()/pread()) and never reads from the file position, which
+    # an os.dup() per child would share anyway
+    if hasattr(asyncio, "TaskGroup"):
+        async with asyncio.TaskGroup() as tg:
+            for child in children:
+                tg.create_task(node.stream_tensor_from_fd(
+                    rank_ids[child], fobj, length, tensor_id=tensor_id))
+    else:
+        # Python < 3.11: schedule each send as it's built, then wait
+        await asyncio.gather(*[
+            asyncio.ensure_future(node.stream_tensor_from_fd(
+                rank_ids[child], fobj, length, tensor_id=tensor_id))
+            for child in children
+        ])
+
+
+async def barrier(node, rank_ids, rank, tag):
+    """
+    Full-mesh rendezvous: send a 1-byte stream to every other rank, then
+    wait for one from each of them
+    
+    Args:
+        tag: barrier number - every rank must pass the same tags in order
+    """
+    base = BARRIER_STREAM_BASE + ITERATION_STREAM_BASE * tag
+    others = [r for r in range(len(rank_ids)) if r != rank]
+    
+    # Forwarders collect payloads - fetch ours so it isn't kept around
+    wait = node.receive_stream if node.collect_received else node.wait_stream_complete
+    
+    await node.broadcast_tensor([rank_ids[r] for r in others], b"\x01",
+                                tensor_id=base + 2 * rank)
+    # Waiting in turn takes as long as the slowest rank - no tasks needed
+    for r in others:
+        await wait(rank_ids[r], base + 2 * r)
+
+
+class UCXPlane:
+    """
+    Tensor payloads over UCX (ucx-py: RDMA on InfiniBand/RoCE) for --transport ucx
+    
+    Only the payload moves: barriers and acks still go over the NodeReady
+    mesh. Rank r is the r-th ASOC_PEERS entry (one task per node, which is
+    how asoc_benchmark.slurm launches) and listens on its port + UCX_PORT_OFFSET.
+    Transports and devices come from UCX's own UCX_TLS / UCX_NET_DEVICES.
+    """
+    
+    def __init__(self, ucp):
+        self.ucp = ucp
+        self.children = []  # endpoints we send to
+        self._listener = None
+        loop = asyncio.get_running_loop()
+        self._parent = loop.create_future()  # endpoint our parent dialed
+        self._closed = loop.create_future()
+    
+    def listen(self, port):
+        """Accept the tree parent's endpoint (before it starts dialing)"""
+        async def on_parent(ep):
+            if not self._parent.done():
+                self._parent.set_result(ep)
+            await self._closed  # keep the endpoint open until close()
+        
+        self._listener = self.ucp.create_listener(on_parent, port=port)
+    
+    async def connect(self, addrs):
+        """Dial each tree child: addrs are (host, port) of their listeners"""
+        for host, port in addrs:
+            self.children.append(await self.ucp.create_endpoint(host, port))
+    
+    async def recv(self, buf):
+        """Receive one tensor from the parent into buf (exactly len(buf) bytes)"""
+        ep = await self._parent
+        await ep.recv(buf)
+    
+    async def send(self, data):
+        """Send data to every child, all from the same buffer"""
+        view = memoryview(data)
+        await asyncio.gather(*[ep.send(view) for ep in self.children])
+    
+    async def close(self):
+        if not self._closed.done():
+            self._closed.set_result(None)
+        for ep in self.children:
+            await ep.close()
+        if self._listener is not None:
+            self._listener.close()
+
+
+def default_interface():
+    """Interface of the default IPv4 route (Linux), or None"""
+    try:
+        with open("/proc/net/route") as f:
+            next(f)  # header
+            for line in f:
+                fields = line.split()
+                if fields[1] == "00000000":
+                    return fields[0]
+    except (OSError, StopIteration, IndexError):
+        pass
+    return None
+
+
+def parse_cpulist(cpulist):
+    """Parse a sysfs cpulist like '0-15,32-47' into a set of CPU numbers"""
+    cpus = set()
+    for part in cpulist.strip().split(","):
+        if not part:
+            continue
+        lo, _, hi = part.partition("-")
+        cpus.update(range(int(lo), int(hi or lo) + 1))
+    return cpus
+
+
+def pin_to_nic_numa(interface=None):
+    """
+    Bind this process to the CPUs of the NUMA node that owns the NIC
+    
+    Keeps send buffers, the event loop and the NIC's DMA on one socket.
+    Uses ASOC_INTERFACE, else the default-route interface.
+    
+    Returns:
+        (interface, numa node) if pinned, None if there is nothing to pin to
+        (virtual NIC, single-node machine, no sched_setaffinity)
+    """
+    interface = interface or os.environ.get("ASOC_INTERFACE") or default_interface()
+    if not interface or not hasattr(os, "sched_setaffinity"):
+        return None
+    
+    try:
+        with open(f"/sys/class/net/{interface}/device/numa_node") as f:
+            numa_node = int(f.read())
+        if numa_node < 0:
+            return None
+        with open(f"/sys/devices/system/node/node{numa_node}/cpulist") as f:
+            cpus = parse_cpulist(f.read())
+        
+        # Stay inside the SLURM allocation
+        cpus &= os.sched_getaffinity(0)
+        if not cpus:
+            return None
+        os.sched_setaffinity(0, cpus)
+    except (OSError, ValueError):
+        return None
+    
+    # Threaded libraries started after this keep to the same cores
+    os.environ.setdefault("OMP_PROC_BIND", "close")
+    os.environ.setdefault("OMP_PLACES", "cores")
+    return interface, numa_node
 
 
 def parse_args():
@@ -32,7 +299,31 @@ def parse_args():
     parser.add_argument("--port", type=int, default=9000, help="Base port")
     parser.add_argument("--tensor-size-mb", type=int, default=100, help="Tensor size in MB")
     parser.add_argument("--iterations", type=int, default=5, help="Number of iterations")
-    return parser.parse_args()
+    parser.add_argument("--sndbuf-mb", type=int, default=None,
+                        help="Peer socket send buffer in MB (default: max(16, tensor-size-mb // 8))")
+    parser.add_argument("--rcvbuf-mb", type=int, default=None,
+                        help="Peer socket receive buffer in MB (default: as --sndbuf-mb)")
+    parser.add_argument("--zerocopy", action="store_true",
+                        help="Rank 0 sends from a file with sendfile() (no user-space copy)")
+    parser.add_argument("--pipeline", action="store_true",
+                        help="Start each iteration without waiting for the previous one's acks")
+    parser.add_argument("--cooldown", type=float, default=0.0,
+                        help="Seconds to pause between iterations (off by default)")
+    parser.add_argument("--transport", choices=("tcp", "ucx"), default="tcp",
+                        help="Payload transport: ASoc over TCP, or UCX/RDMA (needs ucx-py)")
+    args = parser.parse_args()
+    if args.zerocopy and args.transport != "tcp":
+        parser.error("--zerocopy applies to --transport tcp only")
+    if args.pipeline and args.cooldown:
+        parser.error("--cooldown cannot be combined with --pipeline")
+    
+    # Buffers sized to the tensor; the kernel caps them at
+    # net.core.wmem_max / rmem_max, so raise those on the compute nodes too
+    if args.sndbuf_mb is None:
+        args.sndbuf_mb = max(16, args.tensor_size_mb // 8)
+    if args.rcvbuf_mb is None:
+        args.rcvbuf_mb = args.sndbuf_mb
+    return args
 
 
 async def run_benchmark(args):
@@ -44,6 +335,10 @@ async def run_benchmark(args):
     print(f"Node: {args.node_name}")
     print(f"Port: {args.port}")
     
+    pinned = pin_to_nic_numa()
+    if pinned:
+        print(f"📌 Pinned to NUMA node {pinned[1]} ({pinned[0]})")
+    
     # Get configuration from environment
     community = os.environ.get("ASOC_COMMUNITY", "slurm-cluster")
     api_key = os.environ.get("ASOC_API_KEY", "default-key")
@@ -58,38 +353,73 @@ async def run_benchmark(args):
     static_peers = [p.strip() for p in peers_str.split(",") if p.strip()]
     print(f"Community: {community}")
     print(f"Static peers: {len(static_peers)} configured")
+    print(f"Socket buffers: {args.sndbuf_mb}MB send / {args.rcvbuf_mb}MB receive")
     
     # Create node with static configuration (no UDP discovery in HPC)
+    rank_ids = [rank_node_id(community, r) for r in range(args.world_size)]
+    
+    # Rank r is the r-th ASOC_PEERS entry (as for --transport ucx); with one
+    # entry per rank the tree can keep co-located ranks off the network
+    if len(static_peers) == args.world_size:
+        hosts = rank_hosts(static_peers)
+        parent, children = locality_tree(args.rank, hosts)
+        print(f"Topology: {args.world_size} ranks on {len(set(hosts))} hosts")
+    else:
+        parent, children = binomial_tree(args.rank, args.world_size)
+    others = [r for r in range(args.world_size) if r != args.rank]
+    
+    ucx = None
+    if args.transport == "ucx":
+        try:
+            import ucp
+        except ImportError:
+            print("ERROR: --transport ucx needs ucx-py (import ucp)")
+            sys.exit(1)
+        if len(static_peers) != args.world_size:
+            print("ERROR: --transport ucx needs one ASOC_PEERS entry per rank")
+            sys.exit(1)
+        ucx = UCXPlane(ucp)
+        print(f"Transport: UCX (listener on port {args.port + UCX_PORT_OFFSET})")
+    
     node = NodeReady(
         community=community,
         api_key=api_key,
         static_peers=static_peers,
         enable_discovery=False,  # Disable UDP - won't work across compute nodes
-        port=args.port
+        node_id=rank_ids[args.rank],
+        port=args.port,
+        collect_received=parent is not None and ucx is None,  # Receivers read the payload
+        sndbuf=args.sndbuf_mb << 20,
+        rcvbuf=args.rcvbuf_mb << 20
     )
     
     print(f"\nStarting node...")
     await node.start()
     
+    # Everything allocated so far lives for the whole run - move it out of
+    # the GC's generations so any later collection has less to scan
+    gc.collect()
+    gc.freeze()
+    
     # Wait for all nodes to connect
     # In HPC, connections might be slower due to network topology
     connection_timeout = 30
     print(f"Waiting for peer connections (timeout: {connection_timeout}s)...")
     
-    start_wait = time.time()
-    expected_peers = args.world_size - 1  # All nodes except self
+    start_wait = time.perf_counter()
+    expected = [rank_ids[r] for r in others]  # All ranks except self
     
-    while time.time() - start_wait < connection_timeout:
-        peers = node.get_peer_ids()
-        print(f"  Connected to {len(peers)}/{expected_peers} peers...", end='\r')
-        
-        if len(peers) >= expected_peers:
-            break
-        
-        await asyncio.sleep(1)
+    # Woken as each rank identifies - our own address is in ASOC_PEERS too,
+    # so wait on rank IDs rather than counting connections
+    try:
+        await asyncio.wait_for(node.wait_for_peers(expected), timeout=connection_timeout)
+    except asyncio.TimeoutError:
+        pass
     
-    peers = node.get_peer_ids()
-    print(f"\n✓ Connected to {len(peers)} peers                    ")
+    connected = set(node.get_peer_ids())
+    peers = [p for p in expected if p in connected]
+    print(f"✓ Connected to {len(peers)}/{len(expected)} peers "
+          f"in {time.perf_counter() - start_wait:.2f}s")
     
     if len(peers) == 0:
         print("\n⚠️  WARNING: No peers connected!")
@@ -102,37 +432,57 @@ async def run_benchmark(args):
     
     # Synchronization barrier - make sure all nodes are ready
     print("\nSynchronizing with all nodes...")
-    await asyncio.sleep(5)  # Simple barrier
+    if ucx:
+        ucx.listen(args.port + UCX_PORT_OFFSET)
+    await barrier(node, rank_ids, args.rank, tag=0)
+    if ucx:
+        # Every listener is up once the barrier is through
+        addrs = []
+        for child in children:
+            host, port = static_peers[child].rsplit(":", 1)
+            addrs.append((host, int(port) + UCX_PORT_OFFSET))
+        await ucx.connect(addrs)
+    
+    # No cyclic GC pauses inside the timed iterations (re-enabled below)
+    gc.disable()
     
-    # Benchmark: Rank 0 sends to all others, others receive
+    # Benchmark: binomial-tree broadcast from rank 0 - every rank that has
+    # the tensor forwards it, so rank 0 sends log2(N) copies instead of N-1
     if args.rank == 0:
         print(f"\n{'='*70}")
-        print(f"RANK 0: Broadcasting tensors to {len(peers)} peers")
+        print(f"RANK 0: Broadcasting tensors to {len(others)} peers "
+              f"(tree, {len(children)} direct children)")
         print(f"{'='*70}")
         
         tensor_size = args.tensor_size_mb * 1024 * 1024
         results = []
         
-        for iteration in range(args.iterations):
-            print(f"\nIteration {iteration + 1}/{args.iterations}")
-            
-            # Generate tensor data
-            tensor_data = np.random.bytes(tensor_size)
-            
-            # Broadcast to all peers
-            start = time.perf_counter()
-            
-            tasks = []
-            for peer_id in peers:
-                task = node.stream_tensor(peer_id, tensor_data)
-                tasks.append(task)
-            
-            await asyncio.gather(*tasks)
-            
-            elapsed = time.perf_counter() - start
+        # Contents don't matter for bandwidth: an anonymous mapping is
+        # zero-filled without generating anything. Touch every page once
+        # so the first iteration doesn't pay for the page faults
+        tensor_data = memoryview(mmap.mmap(-1, tensor_size))
+        tensor_data[::mmap.PAGESIZE] = bytes(len(range(0, tensor_size, mmap.PAGESIZE)))
+        
+        # --zerocopy: stage it in a file once, then every send is sendfile()
+        tensor_file = None
+        if args.zerocopy:
+            tensor_file = tempfile.TemporaryFile()
+            tensor_file.write(tensor_data)
+            tensor_file.flush()
+            print("⚡ Zero-copy sends (sendfile)")
+        
+        # (peer, ack stream offset) per rank, built once (acks complete in
+        # any order, so awaiting them one by one ends with the last - no
+        # tasks per iteration)
+        acks = [(rank_ids[r], 2 * r) for r in others]
+        perf_counter_ns = time.perf_counter_ns
+        
+        def record(iteration, start_ns, end_ns):
+            # Integer nanoseconds - converted once, no float subtraction
+            elapsed = (end_ns - start_ns) / 1e9
             
             # Calculate metrics
-            total_data_mb = args.tensor_size_mb * len(peers)
+            total_data_mb = args.tensor_size_mb * len(others)
             aggregate_throughput = total_data_mb / elapsed
             per_peer_throughput = args.tensor_size_mb / elapsed
             
@@ -143,13 +493,55 @@ async def run_benchmark(args):
                 'per_peer_mbps': per_peer_throughput
             })
             
-            print(f"  Elapsed: {elapsed:.2f}s")
+            print(f"\nIteration {iteration + 1}/{args.iterations}")
+            print(f"  Elapsed: {elapsed:.3f}s")
             print(f"  Total data: {total_data_mb}MB")
             print(f"  Aggregate throughput: {aggregate_throughput:.1f} MB/s")
             print(f"  Per-peer throughput: {per_peer_throughput:.1f} MB/s")
+        
+        async def acked(tensor_id):
+            """perf_counter_ns() once every rank has acked tensor_id"""
+            for peer_id, ack_id in acks:
+                await node.wait_stream_complete(peer_id, tensor_id + ack_id)
+            return perf_counter_ns()
+        
+        in_flight = []  # --pipeline: (iteration, start_ns, acked task)
+        first_start_ns = perf_counter_ns()
+        
+        for iteration in range(args.iterations):
+            tensor_id = ITERATION_STREAM_BASE * (iteration + 1)
+            
+            # Broadcast down the tree; done when every rank has acked
+            start_ns = perf_counter_ns()
+            
+            stamp = SEND_STAMP.pack(time.time_ns())
+            if tensor_file:
+                os.pwrite(tensor_file.fileno(), stamp, 0)
+            else:
+                tensor_data[:SEND_STAMP.size] = stamp
+            
+            if ucx:
+                await ucx.send(tensor_data)
+            elif tensor_file:
+                await broadcast_file(node, rank_ids, children, tensor_id,
+                                     tensor_file, tensor_size)
+            else:
+                await broadcast_tensor(node, rank_ids, children, tensor_id, tensor_data)
             
-            # Cool down between iterations
-            await asyncio.sleep(2)
+            if args.pipeline:
+                # Next iteration goes out while this one's acks are pending
+                in_flight.append((iteration, start_ns, asyncio.ensure_future(acked(tensor_id))))
+            else:
+                record(iteration, start_ns, await acked(tensor_id))
+                if args.cooldown:
+                    await asyncio.sleep(args.cooldown)
+        
+        for iteration, start_ns, done in in_flight:
+            record(iteration, start_ns, await done)
+        wall = (perf_counter_ns() - first_start_ns) / 1e9
+        
+        if tensor_file:
+            tensor_file.close()
         
         # Summary
         print(f"\n{'='*70}")
@@ -158,13 +550,30 @@ async def run_benchmark(args):
         print(f"World size: {args.world_size} nodes")
         print(f"Tensor size: {args.tensor_size_mb}MB")
         print(f"Iterations: {args.iterations}")
+        send_path = "UCX" if ucx else "sendfile" if args.zerocopy else "socket write"
+        print(f"Send path: {send_path}")
         print(f"\nResults:")
         
-        avg_aggregate = sum(r['aggregate_mbps'] for r in results) / len(results)
-        avg_per_peer = sum(r['per_peer_mbps'] for r in results) / len(results)
+        # One pass for both averages
+        total_aggregate = total_per_peer = 0.0
+        for r in results:
+            total_aggregate += r['aggregate_mbps']
+            total_per_peer += r['per_peer_mbps']
+        avg_aggregate = total_aggregate / len(results)
+        avg_per_peer = total_per_peer / len(results)
+        
+        # Tail: slow iterations matter as much as the average
+        elapsed = sorted(r['elapsed'] for r in results)
+        p95_elapsed = tail(elapsed, 0.95)
         
         print(f"  Average aggregate throughput: {avg_aggregate:.1f} MB/s")
         print(f"  Average per-peer throughput: {avg_per_peer:.1f} MB/s")
+        if args.pipeline:
+            total_mb = args.tensor_size_mb * len(others) * args.iterations
+            print(f"  Pipelined throughput: {total_mb / wall:.1f} MB/s "
+                  f"({args.iterations} iterations in {wall:.3f}s)")
+        print(f"  Iteration time: min {elapsed[0]:.3f}s / "
+              f"p95 {p95_elapsed:.3f}s / max {elapsed[-1]:.3f}s")
         print(f"  Protocol overhead: 0.001% (14 bytes per 1MB frame)")
         
     else:
@@ -173,18 +582,52 @@ async def run_benchmark(args):
         print(f"RANK {args.rank}: Receiving tensors")
         print(f"{'='*70}")
         
-        # Just wait and receive
-        # The _recv_loop in node_ready.py handles incoming data
-        total_wait = args.iterations * 10  # 10 seconds per iteration
+        print(f"Parent: rank {parent}, forwarding to: {children or 'none'}")
         print(f"Waiting to receive {args.iterations} iterations...")
         
-        await asyncio.sleep(total_wait)
+        # UCX receives into one buffer, reused every iteration
+        if ucx:
+            tensor_data = bytearray(args.tensor_size_mb * 1024 * 1024)
+        
+        # Rank 0 send -> our arrival, per iteration (ns, wall clock)
+        deltas = []
+        
+        for iteration in range(args.iterations):
+            tensor_id = ITERATION_STREAM_BASE * (iteration + 1)
+            
+            if ucx:
+                await ucx.recv(tensor_data)
+            else:
+                # Woken by FRAME_END from the parent - no fixed sleep
+                tensor_data = await node.receive_stream(rank_ids[parent], tensor_id)
+            deltas.append(time.time_ns() - SEND_STAMP.unpack_from(tensor_data)[0])
+            
+            if ucx:
+                await ucx.send(tensor_data)
+            else:
+                await broadcast_tensor(node, rank_ids, children, tensor_id, tensor_data)
+            await node.stream_tensor(rank_ids[0], b"\x01", tensor_id=tensor_id + 2 * args.rank)
+            print(f"  Iteration {iteration + 1}: received {len(tensor_data) >> 20}MB")
         
         print(f"\n✓ Completed receiving")
+        
+        # One-way times compare two clocks - only as good as NTP/PTP sync;
+        # without it, read them for spread between iterations and ranks
+        deltas.sort()
+        print(f"One-way from rank 0 (needs synced clocks): "
+              f"p50 {tail(deltas, 0.50) / 1e6:.2f}ms / "
+              f"p95 {tail(deltas, 0.95) / 1e6:.2f}ms / "
+              f"p99 {tail(deltas, 0.99) / 1e6:.2f}ms")
     
-    # Final synchronization
+    gc.enable()
+    gc.collect()
+    
+    # Final synchronization - nobody shuts down while others still send
     print("\nFinalizing...")
-    await asyncio.sleep(3)
+    await barrier(node, rank_ids, args.rank, tag=1)
+    
+    if ucx:
+        await ucx.close()
     
     # Shutdown
     print("Shutting down node...")
@@ -198,6 +641,12 @@ async def run_benchmark(args):
 def main():
     args = parse_args()
     
+    if args.zerocopy:
+        # uvloop has no loop.sendfile() - stay on asyncio's loop
+        print("ℹ️  --zerocopy: using the asyncio event loop (uvloop has no sendfile)")
+    elif use_uvloop():
+        print("⚡ Using uvloop event loop")
+    
     try:
         asyncio.run(run_benchmark(args))
     except KeyboardInterrupt:
@@ -7,6 +7,7 @@ Run this first to make sure everything is working before benchmarking
 
 import asyncio
 import sys
+import time
 
 # Check Python version
 if sys.version_info < (3, 7):
@@ -18,7 +19,7 @@ print("✓ Python version OK")
 
 # Try imports
 try:
-    from asoc import NodeReady
+    from asoc import NodeReady, use_uvloop
     print("✓ asoc.NodeReady imported")
 except ImportError as e:
     print(f"❌ Error importing asoc: {e}")
@@ -67,36 +68,63 @@ async def test_connection():
     await node2.start()
     print("✓ Nodes started")
     
-    print("\n3. Waiting for discovery (5 seconds)...")
-    for i in range(5, 0, -1):
-        print(f"   {i}...", end='\r')
-        await asyncio.sleep(1)
-    print("   Done!   ")
+    print("\n3. Waiting for discovery (up to 5 seconds)...")
+    # Whichever node accepts the other's connection identifies it first
+    waits = {
+        asyncio.ensure_future(node1.wait_for_peers([node2.node_id])): (node1, node2),
+        asyncio.ensure_future(node2.wait_for_peers([node1.node_id])): (node2, node1),
+    }
+    start = time.perf_counter()
+    done, pending = await asyncio.wait(waits, timeout=5.0,
+                                       return_when=asyncio.FIRST_COMPLETED)
+    for task in pending:
+        task.cancel()
     
     print("\n4. Checking connection...")
-    peers1 = node1.get_peer_ids()
-    peers2 = node2.get_peer_ids()
-    
-    if peers1:
-        print(f"✓ Node 1 connected to: {peers1[0][:8]}...")
-    else:
-        print("⚠️  Node 1 has no peers")
-    
-    if peers2:
-        print(f"✓ Node 2 connected to: {peers2[0][:8]}...")
+    connected = bool(done)
+    if connected:
+        sender, receiver = waits[done.pop()]
+        print(f"✓ {sender.node_id[:8]} connected to {receiver.node_id[:8]} "
+              f"in {(time.perf_counter() - start) * 1000:.0f}ms")
     else:
-        print("⚠️  Node 2 has no peers")
+        print("⚠️  Nodes did not connect")
     
-    if peers1 and peers2:
+    if connected:
         print("\n5. Testing data transfer...")
-        test_data = b"Hello, ASoc!" * 100
         
         try:
-            await node1.stream_tensor(peers1[0], test_data)
-            print("✓ Data sent successfully")
+            # Ping-pong: the receiver echoes each stream back as stream_id + 1
+            rounds = 32
+            ping = b"Hello, ASoc!" * 100
+            
+            async def echo():
+                for _ in range(rounds):
+                    stream_id = await pings.get()
+                    await receiver.wait_stream_complete(sender.node_id, stream_id)
+                    await receiver.stream_tensor(sender.node_id, b"pong", tensor_id=stream_id + 1)
             
-            # Small delay for receiver
-            await asyncio.sleep(0.5)
+            pings = asyncio.Queue()
+            echo_task = asyncio.ensure_future(echo())
+            rtts = []
+            for _ in range(rounds):
+                t0 = time.perf_counter_ns()
+                stream_id = await sender.stream_tensor(receiver.node_id, ping)
+                pings.put_nowait(stream_id)
+                await asyncio.wait_for(sender.wait_stream_complete(receiver.node_id, stream_id + 1), timeout=5.0)
+                rtts.append(time.perf_counter_ns() - t0)
+            await echo_task
+            
+            rtts.sort()
+            print(f"✓ Ping-pong ({rounds} x {len(ping)} bytes): "
+                  f"min {rtts[0] / 1e3:.0f}µs / median {rtts[rounds // 2] / 1e3:.0f}µs RTT")
+            
+            # One large tensor for the multi-frame path
+            big = bytes(16 << 20)
+            t0 = time.perf_counter_ns()
+            stream_id = await sender.stream_tensor(receiver.node_id, big)
+            await asyncio.wait_for(receiver.wait_stream_complete(sender.node_id, stream_id), timeout=5.0)
+            elapsed = (time.perf_counter_ns() - t0) / 1e9
+            print(f"✓ 16MB tensor received ({16 / elapsed:.0f} MB/s)")
             
         except Exception as e:
             print(f"❌ Error sending data: {e}")
@@ -113,7 +141,7 @@ async def test_connection():
     print("✓ Clean shutdown")
     
     print("\n" + "="*60)
-    if peers1 and peers2:
+    if connected:
         print("✅ ALL TESTS PASSED - Ready for benchmarking!")
     else:
         print("⚠️  TESTS COMPLETED WITH WARNINGS")
@@ -142,4 +170,8 @@ async def main():
 if __name__ == "__main__":
     print("\nASoc Quick Test")
     print("This will verify your setup is working\n")
+    
+    if use_uvloop():
+        print("⚡ Using uvloop event loop")
+    
     asyncio.run(main())